@@ -1,14 +1,17 @@
-import anthropic
-import google.generativeai as genai
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QTextEdit, 
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, 
                              QLineEdit, QPushButton, QSplitter, QFileDialog, QLabel, 
                              QTabWidget, QStackedWidget, QMessageBox, QInputDialog, QListWidgetItem,
                              QRadioButton, QButtonGroup)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QIcon, QPalette, QColor
 from lib.enhanced_browser import EnhancedTabWidget, get_tab_data
+from lib.chat_store import get_chat_store, MessageCache
+from lib.transcript import TranscriptView
+from lib.workers import ProviderRequest, start_request, DONE, FAILED
+from lib.response_cache import get_response_cache
+from lib.theme import set_style_state
 
-import json
+import time
 import uuid
 
 class TransparentWidget(QWidget):
@@ -16,15 +19,42 @@ class TransparentWidget(QWidget):
         super().__init__(parent)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
 
+# Chat store provider keys (widget class names) -> service names shown in the UI
+PROVIDER_NAMES = {
+    "OllamaWidget": "Ollama",
+    "ClaudeChatWidget": "Claude",
+    "ChatGPTWidget": "ChatGPT",
+    "GeminiChatWidget": "Gemini",
+}
+
+def api_messages(messages):
+    # Only role and content go to a provider; local flags like "cached" stay in the app
+    return [{"role": m["role"], "content": m["content"]} for m in messages]
+
 class AIServiceWidget(TransparentWidget):
     new_message = pyqtSignal(str, str)  # (role, content)
+    request_state_changed = pyqtSignal(str, str)  # (request_id, state)
+    open_chat_requested = pyqtSignal(str, str)  # (provider, chat_id) for search hits in other services
 
     def __init__(self, api_key):
         super().__init__()
         self.api_key = api_key
+        self.provider = self.__class__.__name__
+        self.store = get_chat_store()
+        self.message_cache = MessageCache(self.store)
         self.current_chat_id = None
         self.current_chat = []
         self.chat_history = {}
+        self.active_requests = {}
+        self.response_cache = None  # Set by LLMPage when [Settings] ResponseCache is on
+        self.pending_cache_entry = None
+        self.stream_chat_id = None
+        self.stream_parts = []
+        self.stream_row_visible = False
+        self.stream_timer = QTimer(self)
+        self.stream_timer.setSingleShot(True)
+        self.stream_timer.setInterval(50)
+        self.stream_timer.timeout.connect(self.flush_stream)
         self.setup_ui()
         self.load_chat_history()
 
@@ -44,35 +74,53 @@ class AIServiceWidget(TransparentWidget):
         history_layout = QVBoxLayout(history_widget)
         new_chat_button = QPushButton("New Chat")
         new_chat_button.clicked.connect(self.new_chat)
-        new_chat_button.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        new_chat_button.setProperty("surface", "glass")
         self.history_list = QListWidget()
         self.history_list.itemClicked.connect(self.load_chat)
-        self.history_list.setStyleSheet("color: white; background-color: transparent;")
+        self.history_list.setProperty("surface", "clear")
+
+        # Search across every provider's history
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search all chats...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setProperty("surface", "glass")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_results = QListWidget()
+        self.search_results.setWordWrap(True)
+        self.search_results.itemClicked.connect(self.open_search_result)
+        self.search_results.setProperty("surface", "clear")
+        self.search_results.hide()
+
         history_layout.addWidget(new_chat_button)
+        history_layout.addWidget(self.search_input)
         history_layout.addWidget(self.history_list)
+        history_layout.addWidget(self.search_results)
 
         # Chat Area (4/5 width)
         chat_area = TransparentWidget()
         chat_area_layout = QVBoxLayout(chat_area)
 
-        self.chat_display = QTextEdit()
-        self.chat_display.setReadOnly(True)
-        self.chat_display.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 10);")
+        self.chat_display = TranscriptView()
+        self.chat_display.setProperty("surface", "tint")
 
         input_area = TransparentWidget()
         input_layout = QHBoxLayout(input_area)
 
         self.message_input = QLineEdit()
         self.message_input.returnPressed.connect(self.send_message)
-        self.message_input.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        self.message_input.setProperty("surface", "glass")
 
         self.attach_button = QPushButton(QIcon("img/attach.png"), "")
         self.attach_button.clicked.connect(self.attach_file)
-        self.attach_button.setStyleSheet("background-color: rgba(255, 255, 255, 30);")
+        self.attach_button.setProperty("surface", "glass")
 
         self.send_button = QPushButton("Send")
         self.send_button.clicked.connect(self.send_message)
-        self.send_button.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        self.send_button.setProperty("surface", "glass")
 
         input_layout.addWidget(self.message_input)
         input_layout.addWidget(self.attach_button)
@@ -106,47 +154,172 @@ class AIServiceWidget(TransparentWidget):
             self.message_input.setText(f"Attached file: {file_path}")
 
     def update_chat_display(self):
-        self.chat_display.clear()
-        for message in self.current_chat:
-            role = message["role"].capitalize()
-            content = message["content"]
-            self.chat_display.append(f"<font color='white'><b>{role}:</b> {content}</font><br><br>")
+        self.chat_display.set_messages(self.current_chat)
+        self.stream_row_visible = False
 
     def load_chat(self, item):
-        self.current_chat_id = item.data(Qt.ItemDataRole.UserRole)
-        self.current_chat = self.chat_history[self.current_chat_id]['messages']
+        self.open_chat(item.data(Qt.ItemDataRole.UserRole))
+
+    def open_chat(self, chat_id):
+        if chat_id not in self.chat_history:
+            return
+        self.current_chat_id = chat_id
+        self.current_chat = self.message_cache.get(chat_id)
         self.update_chat_display()
+        for row in range(self.history_list.count()):
+            if self.history_list.item(row).data(Qt.ItemDataRole.UserRole) == chat_id:
+                self.history_list.setCurrentRow(row)
+                break
+
+    def run_search(self):
+        query = self.search_input.text().strip()
+        self.search_results.clear()
+        if not query:
+            self.search_results.hide()
+            self.history_list.show()
+            return
+
+        seen_chats = set()
+        for chat_id, provider, chat_name, role, snippet in self.store.search(query):
+            if chat_id in seen_chats:
+                continue  # Keep only the best-ranked hit per conversation
+            seen_chats.add(chat_id)
+            item = QListWidgetItem(f"{chat_name} ({PROVIDER_NAMES.get(provider, provider)})\n{snippet}")
+            item.setData(Qt.ItemDataRole.UserRole, (provider, chat_id))
+            self.search_results.addItem(item)
+        if not seen_chats:
+            self.search_results.addItem(QListWidgetItem("No matches"))
+        self.history_list.hide()
+        self.search_results.show()
+
+    def open_search_result(self, item):
+        hit = item.data(Qt.ItemDataRole.UserRole)
+        if not hit:
+            return
+        provider, chat_id = hit
+        if provider == self.provider:
+            self.open_chat(chat_id)
+        else:
+            self.open_chat_requested.emit(provider, chat_id)
 
     def new_chat(self):
         chat_name, ok = QInputDialog.getText(self, "New Chat", "Enter a name for the new chat:")
         if ok and chat_name:
             self.current_chat_id = str(uuid.uuid4())
-            self.chat_history[self.current_chat_id] = {'name': chat_name, 'messages': []}
-            self.current_chat = []
+            self.store.create_chat(self.current_chat_id, self.provider, chat_name)
+            now = time.time()
+            self.chat_history[self.current_chat_id] = {'name': chat_name, 'created': now, 'updated': now}
+            self.current_chat = self.message_cache.get(self.current_chat_id)
             self.update_chat_display()
             self.update_history_list()
-            self.save_chat_history()
+
+    def add_message(self, role, content, chat_id=None, display=True, cached=False):
+        # Persist just this message; the rest of the history is never rewritten
+        if chat_id is None:
+            chat_id = self.current_chat_id
+        messages = self.message_cache.get(chat_id)
+        messages.append({"role": role, "content": content, "cached": cached})
+        self.store.append_message(chat_id, role, content, cached)
+        self.chat_history[chat_id]['updated'] = time.time()
+        if chat_id == self.current_chat_id:
+            self.current_chat = messages
+            if display:
+                self.chat_display.append_message(role, content, cached)
+
+    def respond_from_cache(self, model, messages, params=None):
+        # Answer from the response cache when possible; otherwise remember the key
+        # so the provider's reply is stored once it arrives
+        self.pending_cache_entry = None
+        if self.response_cache is None:
+            return False
+        key = self.response_cache.make_key(self.provider, model, messages, params)
+        cached_response = self.response_cache.get(key)
+        if cached_response is None:
+            self.pending_cache_entry = (key, model)
+            return False
+        self.new_message.emit("assistant", cached_response)
+        self.add_message("assistant", cached_response, cached=True)
+        return True
+
+    def dispatch_request(self, fn, *args, stream=False):
+        # Run a provider call on the shared worker pool. The reply is filed under the
+        # chat that was open when the request was sent, even if the user switches away.
+        chat_id = self.current_chat_id
+        request = ProviderRequest(fn, *args, stream=stream)
+        if stream:
+            self.stream_chat_id = chat_id
+            self.stream_parts = []
+            self.stream_row_visible = False
+            request.signals.chunk.connect(self.on_request_chunk)
+        request.signals.state_changed.connect(self.on_request_state_changed)
+        request.signals.finished.connect(lambda request_id, result: self.on_request_finished(chat_id, result))
+        request.signals.failed.connect(lambda request_id, error: self.on_request_failed(error))
+        self.active_requests[request.request_id] = request
+        self.send_button.setEnabled(False)
+        return start_request(request)
+
+    def on_request_state_changed(self, request_id, state):
+        if state in (DONE, FAILED):
+            self.active_requests.pop(request_id, None)
+        self.send_button.setEnabled(not self.active_requests)
+        self.request_state_changed.emit(request_id, state)
+
+    def on_request_chunk(self, request_id, text):
+        # Chunks are buffered and painted at most every 50 ms, so a fast model
+        # doesn't trigger a relayout of the last message for every token
+        self.stream_parts.append(text)
+        if not self.stream_timer.isActive():
+            self.stream_timer.start()
+
+    def flush_stream(self):
+        if self.stream_chat_id != self.current_chat_id or not self.stream_parts:
+            return
+        partial = "".join(self.stream_parts)
+        if self.stream_row_visible:
+            self.chat_display.update_last_message(partial)
+        else:
+            self.chat_display.append_message("assistant", partial)
+            self.stream_row_visible = True
+
+    def reset_stream(self):
+        self.stream_timer.stop()
+        self.stream_chat_id = None
+        self.stream_parts = []
+        self.stream_row_visible = False
+
+    def on_request_failed(self, error):
+        # A failed reply is dropped entirely: the partial streamed text is removed from
+        # the transcript and nothing is saved, so it can't be mistaken for a real answer
+        if self.stream_row_visible and self.stream_chat_id == self.current_chat_id:
+            self.chat_display.remove_last_message()
+        self.reset_stream()
+        self.pending_cache_entry = None
+        self.show_error_message(error)
+
+    def on_request_finished(self, chat_id, assistant_message):
+        streamed_row = self.stream_row_visible and chat_id == self.stream_chat_id == self.current_chat_id
+        if streamed_row:
+            self.chat_display.update_last_message(assistant_message)
+        self.reset_stream()
+
+        self.new_message.emit("assistant", assistant_message)
+        self.add_message("assistant", assistant_message, chat_id, display=not streamed_row)
+        if self.pending_cache_entry and self.response_cache is not None:
+            key, model = self.pending_cache_entry
+            self.response_cache.put(key, self.provider, model, assistant_message)
+        self.pending_cache_entry = None
 
     def update_history_list(self):
         self.history_list.clear()
         for chat_id, chat_data in self.chat_history.items():
             item = QListWidgetItem(chat_data['name'])
             item.setData(Qt.ItemDataRole.UserRole, chat_id)
+            item.setToolTip(time.strftime("Last message: %Y-%m-%d %H:%M", time.localtime(chat_data['updated'])))
             self.history_list.addItem(item)
 
     def load_chat_history(self):
-        try:
-            with open(f'history/{self.__class__.__name__}_history.json', 'r') as f:
-                self.chat_history = json.load(f)
-            self.update_history_list()
-        except FileNotFoundError:
-            self.chat_history = {}
-
-    def save_chat_history(self):
-        if self.current_chat_id:
-            self.chat_history[self.current_chat_id]['messages'] = self.current_chat
-        with open(f'history/{self.__class__.__name__}_history.json', 'w') as f:
-            json.dump(self.chat_history, f)
+        self.store.migrate_legacy_history(self.provider)
+        self.chat_history = self.store.list_chats(self.provider)
         self.update_history_list()
 
     def show_error_message(self, message):
@@ -159,6 +332,7 @@ class AIServiceWidget(TransparentWidget):
 
 class ClaudeChatWidget(AIServiceWidget):
     def __init__(self, api_key):
+        import anthropic  # Heavy SDK; only paid for once Claude is actually opened
         self.client = anthropic.Anthropic(api_key=api_key)
         super().__init__(api_key)
 
@@ -169,45 +343,39 @@ class ClaudeChatWidget(AIServiceWidget):
         self.model_group = QButtonGroup(self)
         for i, model in enumerate(self.get_models()):
             radio = QRadioButton(model)
-            radio.setStyleSheet("""
-                QRadioButton {
-                    color: white;
-                }
-                QRadioButton::indicator:checked {
-                    background-color: black;
-                    border: 2px solid white;
-                }
-            """)
             self.model_group.addButton(radio, i)
             layout.addWidget(radio)
         self.model_group.button(0).setChecked(True)
 
     def send_message(self):
         user_message = self.message_input.text()
-        if user_message:
+        if user_message and not self.active_requests:
             if not self.current_chat_id:
                 self.new_chat()
+                if not self.current_chat_id:
+                    return
 
             self.new_message.emit("user", user_message)
-            self.current_chat.append({"role": "user", "content": user_message})
-            self.update_chat_display()
+            self.add_message("user", user_message)
             self.message_input.clear()
 
             try:
                 model = self.model_group.checkedButton().text()
-                response = self.client.messages.create(
-                    model=model,
-                    max_tokens=1000,
-                    messages=self.current_chat
-                )
-                assistant_message = response.content[0].text
-                self.new_message.emit("assistant", assistant_message)
-                self.current_chat.append({"role": "assistant", "content": assistant_message})
-                self.update_chat_display()
-                self.save_chat_history()
+                messages = api_messages(self.current_chat)
+                if self.respond_from_cache(model, messages, {"max_tokens": 1000}):
+                    return
+                self.dispatch_request(self.get_claude_response, model, messages)
             except Exception as e:
                 self.show_error_message(str(e))
 
+    def get_claude_response(self, model, messages):
+        response = self.client.messages.create(
+            model=model,
+            max_tokens=1000,
+            messages=messages
+        )
+        return response.content[0].text
+
 class ChatGPTWidget(AIServiceWidget):
     def __init__(self, api_key):
         self.client = None  # Initialize OpenAI client here
@@ -220,44 +388,37 @@ class ChatGPTWidget(AIServiceWidget):
         self.model_group = QButtonGroup(self)
         for i, model in enumerate(self.get_models()):
             radio = QRadioButton(model)
-            radio.setStyleSheet("""
-                QRadioButton {
-                    color: white;
-                }
-                QRadioButton::indicator:checked {
-                    background-color: black;
-                    border: 2px solid white;
-                }
-            """)
             self.model_group.addButton(radio, i)
             layout.addWidget(radio)
         self.model_group.button(0).setChecked(True)
 
     def send_message(self):
         user_message = self.message_input.text()
-        if user_message:
+        if user_message and not self.active_requests:
             if not self.current_chat_id:
                 self.new_chat()
+                if not self.current_chat_id:
+                    return
 
             self.new_message.emit("user", user_message)
-            self.current_chat.append({"role": "user", "content": user_message})
-            self.update_chat_display()
+            self.add_message("user", user_message)
             self.message_input.clear()
 
             try:
                 model = self.model_group.checkedButton().text()
-                # Implement ChatGPT API call here
-                assistant_message = "ChatGPT response not implemented yet."
-                self.new_message.emit("assistant", assistant_message)
-                self.current_chat.append({"role": "assistant", "content": assistant_message})
-                self.update_chat_display()
-                self.save_chat_history()
+                self.dispatch_request(self.get_chatgpt_response, model, api_messages(self.current_chat))
             except Exception as e:
                 self.show_error_message(str(e))
 
+    def get_chatgpt_response(self, model, messages):
+        # Implement ChatGPT API call here
+        return "ChatGPT response not implemented yet."
+
 class GeminiChatWidget(AIServiceWidget):
     def __init__(self, api_key):
-        genai.configure(api_key=api_key)
+        import google.generativeai as genai  # Heavy SDK; only paid for once Gemini is actually opened
+        self.genai = genai
+        self.genai.configure(api_key=api_key)
         self.model = None
         super().__init__(api_key)
 
@@ -268,50 +429,45 @@ class GeminiChatWidget(AIServiceWidget):
         self.model_group = QButtonGroup(self)
         for i, model in enumerate(self.get_models()):
             radio = QRadioButton(model)
-            radio.setStyleSheet("""
-                QRadioButton {
-                    color: white;
-                }
-                QRadioButton::indicator:checked {
-                    background-color: black;
-                    border: 2px solid white;
-                }
-            """)
             self.model_group.addButton(radio, i)
             layout.addWidget(radio)
         self.model_group.button(0).setChecked(True)
 
     def send_message(self):
         user_message = self.message_input.text()
-        if user_message:
+        if user_message and not self.active_requests:
             if not self.current_chat_id:
                 self.new_chat()
+                if not self.current_chat_id:
+                    return
 
             self.new_message.emit("user", user_message)
-            self.current_chat.append({"role": "user", "content": user_message})
-            self.update_chat_display()
+            self.add_message("user", user_message)
             self.message_input.clear()
 
             try:
                 model_name = self.model_group.checkedButton().text()
-                if not self.model or self.model.model_name != model_name:
-                    self.model = genai.GenerativeModel(model_name)
-
-                response = self.model.generate_content(user_message)
-                assistant_message = response.text
-                self.new_message.emit("assistant", assistant_message)
-                self.current_chat.append({"role": "assistant", "content": assistant_message})
-                self.update_chat_display()
-                self.save_chat_history()
+                if self.respond_from_cache(model_name, [{"role": "user", "content": user_message}]):
+                    return
+                self.dispatch_request(self.get_gemini_response, model_name, user_message)
             except Exception as e:
                 self.show_error_message(str(e))
 
+    def get_gemini_response(self, model_name, message):
+        if not self.model or self.model.model_name != model_name:
+            self.model = self.genai.GenerativeModel(model_name)
+
+        response = self.model.generate_content(message)
+        return response.text
+
 class LLMPage(TransparentWidget):
     def __init__(self, config, theme_color):
         super().__init__()
         self.config = config
         self.theme_color = theme_color
         self.current_service = None
+        self.service_widgets = {}
+        self.service_factories = {}
         self.setup_ui()
 
     def setup_ui(self):
@@ -325,7 +481,7 @@ class LLMPage(TransparentWidget):
         self.chatgpt_button = QPushButton("ChatGPT")
         self.gemini_button = QPushButton("Gemini")  # Add Gemini button
         for button in [self.ollama_button, self.local_services_button, self.claude_button, self.chatgpt_button, self.gemini_button]:
-            button.setStyleSheet(f"color: white; background-color: rgba(255, 255, 255, 30); border: 1px solid {self.theme_color}; border-radius: 15px; padding: 5px;")
+            button.setProperty("nav", True)
         button_layout.addWidget(self.ollama_button)
         button_layout.addWidget(self.local_services_button)
         button_layout.addWidget(self.claude_button)
@@ -343,9 +499,7 @@ class LLMPage(TransparentWidget):
 
         # Tab widget for local services
         self.tab_widget = EnhancedTabWidget()
-        self.tab_widget.setStyleSheet("QTabWidget::pane { border: 1px solid white; }"
-                                      "QTabBar::tab { color: white; background-color: rgba(255, 255, 255, 30); }"
-                                      "QTabBar::tab:selected { background-color: rgba(255, 255, 255, 60); }")
+        self.tab_widget.setObjectName("localServicesTabs")
         layout.addWidget(self.tab_widget)
 
         # Stacked widget for AI services
@@ -357,62 +511,63 @@ class LLMPage(TransparentWidget):
         ollama_server = self.config['Settings'].get('OllamaServer', '')
         self.ollama_chat = OllamaWidget(self.config, ollama_server)
         self.ai_services_stack.addWidget(self.ollama_chat)
+        self.register_service_widget(self.ollama_chat)
 
-        # Add Claude widget
-        claude_api_key = self.config['Settings'].get('Claude_API_Key', '')
-        if self.config['Settings'].getboolean('Claude', fallback=False) and claude_api_key:
-            self.claude_chat = ClaudeChatWidget(claude_api_key)
-            self.ai_services_stack.addWidget(self.claude_chat)
-        else:
-            self.ai_services_stack.addWidget(QLabel("Claude is not enabled or API key is missing."))
-
-        # Add ChatGPT widget
-        chatgpt_api_key = self.config['Settings'].get('ChatGPT_API_Key', '')
-        if self.config['Settings'].getboolean('ChatGPT', fallback=False) and chatgpt_api_key:
-            self.chatgpt_chat = ChatGPTWidget(chatgpt_api_key)
-            self.ai_services_stack.addWidget(self.chatgpt_chat)
-        else:
-            self.ai_services_stack.addWidget(QLabel("ChatGPT is not enabled or API key is missing."))
-
-        # Add Gemini widget
-        gemini_api_key = self.config['Settings'].get('Gemini_API_Key', '')
-        if self.config['Settings'].getboolean('Gemini', fallback=False) and gemini_api_key:
-            self.gemini_chat = GeminiChatWidget(gemini_api_key)
-            self.ai_services_stack.addWidget(self.gemini_chat)
-        else:
-            self.ai_services_stack.addWidget(QLabel("Gemini is not enabled or API key is missing."))
+        # Add Claude, ChatGPT and Gemini slots. Enabled services get a placeholder
+        # and are built (importing their SDK) the first time they are shown
+        self.add_service_slot("Claude", 'claude_chat', ClaudeChatWidget)
+        self.add_service_slot("ChatGPT", 'chatgpt_chat', ChatGPTWidget)
+        self.add_service_slot("Gemini", 'gemini_chat', GeminiChatWidget)
 
 
         # Show Ollama by default
         self.set_selected_service("Ollama")
 
+    def add_service_slot(self, service, attribute, widget_class):
+        api_key = self.config['Settings'].get(f'{service}_API_Key', '')
+        if self.config['Settings'].getboolean(service, fallback=False) and api_key:
+            index = self.ai_services_stack.addWidget(QWidget())
+            self.service_factories[service] = (index, attribute, lambda: widget_class(api_key))
+        else:
+            self.ai_services_stack.addWidget(QLabel(f"{service} is not enabled or API key is missing."))
+
+    def ensure_service_widget(self, service):
+        entry = self.service_factories.pop(service, None)
+        if entry is None:
+            return
+        index, attribute, factory = entry
+        try:
+            widget = factory()
+        except Exception as e:
+            print(f"Failed to load {service}: {e}")
+            self.service_factories[service] = entry
+            return
+        setattr(self, attribute, widget)
+        placeholder = self.ai_services_stack.widget(index)
+        self.ai_services_stack.insertWidget(index, widget)
+        self.ai_services_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.register_service_widget(widget)
+
+    def register_service_widget(self, widget):
+        self.service_widgets[widget.provider] = widget
+        widget.response_cache = get_response_cache(self.config)
+        widget.open_chat_requested.connect(self.open_chat_from_search)
+
+    def open_chat_from_search(self, provider, chat_id):
+        service = PROVIDER_NAMES[provider]
+        if provider not in self.service_widgets and service not in self.service_factories:
+            return  # That service is disabled in this session
+        self.set_selected_service(service)
+        widget = self.service_widgets.get(provider)
+        if widget is not None:
+            widget.open_chat(chat_id)
+
     def set_selected_service(self, service):
         self.current_service = service
         buttons = [self.ollama_button, self.local_services_button, self.claude_button, self.chatgpt_button, self.gemini_button]
         for button in buttons:
-            if button.text() == service:
-                button.setStyleSheet(f"""
-                    QPushButton {{
-                        color: white;
-                        background-color: rgba(255, 255, 255, 30);
-                        border: 3px solid white;
-                        border-radius: 15px;
-                        padding: 5px;
-                    }}
-                """)
-            else:
-                button.setStyleSheet(f"""
-                    QPushButton {{
-                        color: white;
-                        background-color: rgba(255, 255, 255, 30);
-                        border: 1px solid {self.theme_color};
-                        border-radius: 15px;
-                        padding: 5px;
-                    }}
-                    QPushButton:hover {{
-                        background-color: rgba(255, 255, 255, 45);
-                    }}
-                """)
+            set_style_state(button, "selected", button.text() == service)
         
         # Call the appropriate show method based on the selected service
         if service == "Ollama":
@@ -428,8 +583,7 @@ class LLMPage(TransparentWidget):
 
     def load_local_services(self):
         # Clear existing tabs first
-        while self.tab_widget.count() > 0:
-            self.tab_widget.removeTab(0)
+        self.tab_widget.clear_tabs()
 
         # Add tabs for each LLM service
         for key, url in self.config['LLMs'].items():
@@ -445,16 +599,19 @@ class LLMPage(TransparentWidget):
         self.ai_services_stack.show()
 
     def show_claude(self):
+        self.ensure_service_widget("Claude")
         self.tab_widget.hide()
         self.ai_services_stack.setCurrentIndex(1)  # Assuming Claude is the second widget
         self.ai_services_stack.show()
 
     def show_chatgpt(self):
+        self.ensure_service_widget("ChatGPT")
         self.tab_widget.hide()
         self.ai_services_stack.setCurrentIndex(2)  # Assuming ChatGPT is the third widget
         self.ai_services_stack.show()
 
     def show_gemini(self):
+        self.ensure_service_widget("Gemini")
         self.tab_widget.hide()
         self.ai_services_stack.setCurrentIndex(3)  # Assuming Gemini is the fourth widget
         self.ai_services_stack.show()
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import sqlite3
+from collections import OrderedDict
+
+HISTORY_DIR = 'history'
+CHAT_DB_FILE = os.path.join(HISTORY_DIR, 'chat_history.db')
+MAX_CACHED_CHATS = 8
+
+class ChatStore:
+    def __init__(self, db_file=CHAT_DB_FILE):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+
+        # WAL keeps every append a small sequential write and means a crash
+        # mid-write can never leave the database half rewritten
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+        self.create_search_index()
+        self.compact()
+
+    def create_tables(self):
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS chats
+                             (id TEXT PRIMARY KEY, provider TEXT NOT NULL, name TEXT NOT NULL,
+                              created REAL NOT NULL, updated REAL NOT NULL)''')
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS messages
+                             (id INTEGER PRIMARY KEY AUTOINCREMENT, chat_id TEXT NOT NULL,
+                              role TEXT NOT NULL, content TEXT NOT NULL, created REAL NOT NULL,
+                              cached INTEGER NOT NULL DEFAULT 0)''')
+        # Databases created before replies could come from the response cache lack the column
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(messages)")]
+        if 'cached' not in columns:
+            self.conn.execute("ALTER TABLE messages ADD COLUMN cached INTEGER NOT NULL DEFAULT 0")
+        # chat id -> message rows index, so a conversation is read without scanning the log
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_chat ON messages (chat_id, id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_chats_provider ON chats (provider, created)")
+        self.conn.commit()
+
+    def create_search_index(self):
+        # External-content FTS5 index over message bodies, kept current by triggers
+        try:
+            exists = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'").fetchone()
+            self.conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5
+                                 (content, content='messages', content_rowid='id',
+                                  tokenize='unicode61 remove_diacritics 2')''')
+            self.conn.execute('''CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+                                 INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+                                 END''')
+            self.conn.execute('''CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+                                 INSERT INTO messages_fts (messages_fts, rowid, content)
+                                 VALUES ('delete', old.id, old.content);
+                                 END''')
+            if not exists:
+                self.conn.execute("INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')")
+            self.conn.commit()
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, falling back to LIKE: {e}")
+            self.fts_enabled = False
+
+    def search(self, query, limit=50):
+        # Returns [(chat_id, provider, chat name, role, snippet)], best match first
+        terms = query.split()
+        if not terms:
+            return []
+        if self.fts_enabled:
+            # Quote every term so user input is never parsed as FTS syntax; prefix-match the last one
+            match = " ".join('"' + term.replace('"', '""') + '"' for term in terms) + "*"
+            rows = self.conn.execute(
+                '''SELECT m.chat_id, c.provider, c.name, m.role,
+                          snippet(messages_fts, 0, '', '', '...', 12)
+                   FROM messages_fts
+                   JOIN messages m ON m.id = messages_fts.rowid
+                   JOIN chats c ON c.id = m.chat_id
+                   WHERE messages_fts MATCH ?
+                   ORDER BY rank LIMIT ?''', (match, limit))
+        else:
+            # Escape LIKE wildcards so '%' and '_' in the query match literally
+            pattern = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            rows = self.conn.execute(
+                '''SELECT m.chat_id, c.provider, c.name, m.role, substr(m.content, 1, 80)
+                   FROM messages m JOIN chats c ON c.id = m.chat_id
+                   WHERE m.content LIKE ? ESCAPE '\\' ORDER BY m.id DESC LIMIT ?''', (f"%{pattern}%", limit))
+        return rows.fetchall()
+
+    def migrate_legacy_history(self, provider):
+        # Import the old whole-file history/<Provider>_history.json once
+        legacy_file = os.path.join(HISTORY_DIR, f'{provider}_history.json')
+        if not os.path.exists(legacy_file):
+            return
+        try:
+            with open(legacy_file, 'r') as f:
+                legacy_history = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not migrate {legacy_file}: {e}")
+            return
+
+        now = time.time()
+        with self.conn:
+            for chat_id, chat_data in legacy_history.items():
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO chats (id, provider, name, created, updated) VALUES (?, ?, ?, ?, ?)",
+                    (chat_id, provider, chat_data.get('name', 'Untitled'), now, now))
+                if cursor.rowcount == 0:
+                    continue  # Already imported by an earlier, interrupted migration
+                self.conn.executemany(
+                    "INSERT INTO messages (chat_id, role, content, created) VALUES (?, ?, ?, ?)",
+                    [(chat_id, m['role'], m['content'], now) for m in chat_data.get('messages', [])])
+        os.replace(legacy_file, legacy_file + '.migrated')
+        print(f"Migrated {len(legacy_history)} chats from {legacy_file}")
+
+    def create_chat(self, chat_id, provider, name):
+        now = time.time()
+        with self.conn:
+            self.conn.execute("INSERT INTO chats (id, provider, name, created, updated) VALUES (?, ?, ?, ?, ?)",
+                              (chat_id, provider, name, now, now))
+
+    def append_message(self, chat_id, role, content, cached=False):
+        now = time.time()
+        with self.conn:
+            self.conn.execute("INSERT INTO messages (chat_id, role, content, created, cached) VALUES (?, ?, ?, ?, ?)",
+                              (chat_id, role, content, now, int(cached)))
+            self.conn.execute("UPDATE chats SET updated = ? WHERE id = ?", (now, chat_id))
+
+    def list_chats(self, provider):
+        # Lightweight index for the sidebar; message bodies are not read here
+        chats = {}
+        for chat_id, name, created, updated in self.conn.execute(
+                "SELECT id, name, created, updated FROM chats WHERE provider = ? ORDER BY created, rowid",
+                (provider,)):
+            chats[chat_id] = {'name': name, 'created': created, 'updated': updated}
+        return chats
+
+    def load_messages(self, chat_id):
+        return [{"role": role, "content": content, "cached": bool(cached)} for role, content, cached in self.conn.execute(
+            "SELECT role, content, cached FROM messages WHERE chat_id = ? ORDER BY id", (chat_id,))]
+
+    def compact(self):
+        # Fold the WAL back into the main file, and rebuild the file only once
+        # enough pages are free to be worth it. Both steps are atomic in SQLite.
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if page_count and freelist_count / page_count > 0.25:
+            self.conn.execute("VACUUM")
+
+    def close(self):
+        self.compact()
+        self.conn.close()
+
+class MessageCache:
+    # Bounded LRU of recently opened conversations, loaded from the store on demand
+    def __init__(self, store, max_chats=MAX_CACHED_CHATS):
+        self.store = store
+        self.max_chats = max_chats
+        self.chats = OrderedDict()
+
+    def get(self, chat_id):
+        messages = self.chats.get(chat_id)
+        if messages is None:
+            messages = self.store.load_messages(chat_id)
+            self.chats[chat_id] = messages
+            while len(self.chats) > self.max_chats:
+                self.chats.popitem(last=False)
+        else:
+            self.chats.move_to_end(chat_id)
+        return messages
+
+_chat_store = None
+
+def get_chat_store():
+    global _chat_store
+    if _chat_store is None:
+        _chat_store = ChatStore()
+    return _chat_store
+
+def close_chat_store():
+    global _chat_store
+    if _chat_store is not None:
+        _chat_store.close()
+        _chat_store = None
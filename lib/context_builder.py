@@ -0,0 +1,66 @@
+DEFAULT_CONTEXT_TOKENS = 4096
+PINNED_MESSAGES = 2  # The latest user message and the reply before it are always sent
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+def estimate_tokens(text):
+    # Rough estimate; good enough to keep prompt size bounded without loading a tokenizer
+    return len(text) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+def get_context_budget(config, model):
+    # [Ollama]
+    # ContextTokens = 4096
+    # ModelContextTokens = llama3:70b=8192, mistral=16384
+    budget = config.getint('Ollama', 'ContextTokens', fallback=DEFAULT_CONTEXT_TOKENS)
+    overrides = config.get('Ollama', 'ModelContextTokens', fallback='')
+    for entry in overrides.split(','):
+        name, _, tokens = entry.strip().rpartition('=')
+        if name.strip() == model and tokens.strip().isdigit():
+            return int(tokens)
+    return budget
+
+# Older versions saved failed Ollama requests as assistant turns with these prefixes
+FAILED_TURN_PREFIXES = ("Error: ", "Error parsing response: ")
+
+def is_failed_turn(message):
+    return message["role"] == "assistant" and message["content"].startswith(FAILED_TURN_PREFIXES)
+
+def omitted_note(count):
+    return f"{count} earlier messages of this conversation were omitted to fit the context window."
+
+def build_context(messages, budget, system_prompt=None):
+    # Walk back from the newest message until the budget is spent. The system
+    # prompt and the most recent messages are pinned; older turns are dropped.
+    messages = [m for m in messages if not is_failed_turn(m)]
+    context = []
+    used = 0
+    if system_prompt:
+        context.append({"role": "system", "content": system_prompt})
+        used += estimate_tokens(system_prompt)
+
+    pinned_start = max(0, len(messages) - PINNED_MESSAGES)
+    for message in messages[pinned_start:]:
+        used += estimate_tokens(message["content"])
+
+    first_kept = pinned_start
+    while first_kept > 0:
+        cost = estimate_tokens(messages[first_kept - 1]["content"])
+        if used + cost > budget:
+            break
+        used += cost
+        first_kept -= 1
+
+    if first_kept > 0:
+        # The note is part of the prompt too; drop more old turns until it fits
+        while first_kept < pinned_start and used + estimate_tokens(omitted_note(first_kept)) > budget:
+            used -= estimate_tokens(messages[first_kept]["content"])
+            first_kept += 1
+        note = omitted_note(first_kept)
+        used += estimate_tokens(note)
+        if context:
+            context[0] = {"role": "system", "content": f"{system_prompt}\n\n{note}"}
+        else:
+            context.append({"role": "system", "content": note})
+
+    context.extend({"role": m["role"], "content": m["content"]} for m in messages[first_kept:])
+    return context
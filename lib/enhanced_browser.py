@@ -1,13 +1,18 @@
 import os
+import time
 import hashlib
-from PyQt6.QtWidgets import QTabWidget, QMenu, QFileDialog
+from PyQt6.QtWidgets import QTabWidget, QMenu, QFileDialog, QApplication
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineDownloadRequest
-from PyQt6.QtCore import Qt, QUrl, pyqtSignal, QObject
+from PyQt6.QtCore import Qt, QUrl, QTimer, pyqtSignal, QObject
 from PyQt6.QtGui import QAction, QDesktopServices
 from PyQt6.QtNetwork import QNetworkCookie
 from lib.custom_cookie_jar import CustomCookieJar
 
+PROFILE_NAME = "AI-Garage"
+PROFILE_STORAGE_DIR = os.path.join('db', 'web_profile')
+PROFILE_CACHE_DIR = os.path.join('cache', 'web')
+DEFAULT_WEB_CACHE_MB = 256
 
 class DownloadManager(QObject):
     download_finished = pyqtSignal(str)
@@ -40,18 +45,154 @@ class EnhancedWebEnginePage(QWebEnginePage):
         # Ignore certificate errors (use with caution!)
         return True
 
+DEFAULT_MAX_LIVE_TABS = 4
+DEFAULT_FREEZE_SECONDS = 300
+DEFAULT_DISCARD_SECONDS = 1800
+LIFECYCLE_CHECK_MS = 15000
+
+class TabLifecycle(QObject):
+    # Freezes and discards web tabs that haven't been looked at for a while, and
+    # keeps the number of live (not discarded) renderers under MaxLiveTabs.
+    # Discarded pages keep their URL and reload when they become active again.
+    def __init__(self):
+        super().__init__()
+        self.tab_widgets = []
+        self.max_live = DEFAULT_MAX_LIVE_TABS
+        self.freeze_after = DEFAULT_FREEZE_SECONDS
+        self.discard_after = DEFAULT_DISCARD_SECONDS
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(LIFECYCLE_CHECK_MS)
+
+    def configure(self, config):
+        self.max_live = config['Settings'].getint('MaxLiveTabs', fallback=DEFAULT_MAX_LIVE_TABS)
+        self.freeze_after = config['Settings'].getint('TabFreezeSeconds', fallback=DEFAULT_FREEZE_SECONDS)
+        self.discard_after = config['Settings'].getint('TabDiscardSeconds', fallback=DEFAULT_DISCARD_SECONDS)
+
+    def register(self, tab_widget):
+        self.tab_widgets.append(tab_widget)
+        tab_widget.destroyed.connect(lambda: self.tab_widgets.remove(tab_widget))
+
+    def loaded_views(self):
+        views = []
+        for tab_widget in self.tab_widgets:
+            for i in range(tab_widget.count()):
+                view = tab_widget.widget(i)
+                if isinstance(view, EnhancedWebEngineView) and view.pending_url is None:
+                    views.append(view)
+        return views
+
+    def set_state(self, view, state):
+        # Only ever move a page to a deeper state (Qt can't take a Discarded page back to
+        # Frozen), and never further than Qt recommends (e.g. pages playing audio stay active)
+        if view.isVisible() or view.page.lifecycleState().value >= state.value:
+            return False
+        if view.page.recommendedState().value < state.value:
+            return False
+        view.page.setLifecycleState(state)
+        return view.page.lifecycleState() == state
+
+    def check(self):
+        LifecycleState = QWebEnginePage.LifecycleState
+        now = time.monotonic()
+        live = []
+        for view in self.loaded_views():
+            if view.isVisible():
+                view.last_active = now
+            idle = now - view.last_active
+            if idle > self.discard_after:
+                self.set_state(view, LifecycleState.Discarded)
+            elif idle > self.freeze_after:
+                self.set_state(view, LifecycleState.Frozen)
+            if view.page.lifecycleState() != LifecycleState.Discarded:
+                live.append(view)
+
+        # Over the cap: discard the least recently used renderers first
+        live.sort(key=lambda v: v.last_active)
+        excess = len(live) - self.max_live
+        for view in live:
+            if excess <= 0:
+                break
+            if self.set_state(view, LifecycleState.Discarded):
+                excess -= 1
+
+_shared_profile = None
+_shared_cookie_jar = None
+_download_manager = None
+
+def get_persistent_storage_path():
+    path = os.path.abspath(PROFILE_STORAGE_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_shared_cookie_jar():
+    global _shared_cookie_jar
+    if _shared_cookie_jar is None:
+        _shared_cookie_jar = CustomCookieJar(PROFILE_NAME)
+    return _shared_cookie_jar
+
+def get_shared_profile(config=None):
+    # One profile for every web tab, so cookies, logins and the HTTP disk cache are
+    # shared. The first caller's config sets the cache size ([Settings] WebCacheMB).
+    global _shared_profile, _download_manager
+    if _shared_profile is not None:
+        return _shared_profile
+
+    cache_mb = DEFAULT_WEB_CACHE_MB
+    if config is not None:
+        cache_mb = config['Settings'].getint('WebCacheMB', fallback=DEFAULT_WEB_CACHE_MB)
+    cache_path = os.path.abspath(PROFILE_CACHE_DIR)
+    os.makedirs(cache_path, exist_ok=True)
+
+    # Parented to the application so it outlives every page that uses it
+    profile = QWebEngineProfile(PROFILE_NAME, QApplication.instance())
+    profile.setPersistentStoragePath(get_persistent_storage_path())
+    profile.setCachePath(cache_path)
+    profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+    profile.setHttpCacheMaximumSize(cache_mb * 1024 * 1024)
+    profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies)
+
+    _download_manager = DownloadManager(profile)
+    profile.downloadRequested.connect(_download_manager.handle_download)
+
+    cookie_jar = get_shared_cookie_jar()
+    cookie_store = profile.cookieStore()
+    cookie_store.cookieAdded.connect(lambda cookie: on_cookie_added(cookie_jar, cookie))
+    cookie_store.cookieRemoved.connect(lambda cookie: on_cookie_removed(cookie_jar, cookie))
+
+    _shared_profile = profile
+    return profile
+
+def on_cookie_added(cookie_jar, cookie):
+    url = QUrl(f"http://{cookie.domain()}")
+    cookie_jar.save_cookies(url.toString(), [cookie])
+
+def on_cookie_removed(cookie_jar, cookie):
+    url = QUrl(f"http://{cookie.domain()}")
+    cookies = cookie_jar.load_cookies(url.toString())
+    cookies = [c for c in cookies if c.name() != cookie.name()]
+    cookie_jar.save_cookies(url.toString(), cookies)
+
+_tab_lifecycle = None
+
+def get_tab_lifecycle():
+    global _tab_lifecycle
+    if _tab_lifecycle is None:
+        _tab_lifecycle = TabLifecycle()
+    return _tab_lifecycle
+
 class EnhancedWebEngineView(QWebEngineView):
     def __init__(self, profile, cookie_jar, parent=None):
         super().__init__(parent)
         self.cookie_jar = cookie_jar
+        self.pending_url = None
+        self.last_active = time.monotonic()
         self.page = EnhancedWebEnginePage(profile, self)
         self.setPage(self.page)
         self.loadFinished.connect(self.on_load_finished)
 
-        # Set up cookie handling
+        # Cookie changes are mirrored into the jar once, by the shared profile
         self.cookie_store = self.page.profile().cookieStore()
-        self.cookie_store.cookieAdded.connect(self.on_cookie_added)
-        self.cookie_store.cookieRemoved.connect(self.on_cookie_removed)
 
     def createWindow(self, window_type):
         new_view = EnhancedWebEngineView(self.page.profile(), self.cookie_jar, self.parent())
@@ -62,65 +203,44 @@ class EnhancedWebEngineView(QWebEngineView):
         if ok:
             print(f"Page loaded: {self.url().toString()}")
 
-    def on_cookie_added(self, cookie):
-        url = QUrl(f"http://{cookie.domain()}")
-        self.cookie_jar.save_cookies(url.toString(), [cookie])
-
-    def on_cookie_removed(self, cookie):
-        url = QUrl(f"http://{cookie.domain()}")
-        cookies = self.cookie_jar.load_cookies(url.toString())
-        cookies = [c for c in cookies if c.name() != cookie.name()]
-        self.cookie_jar.save_cookies(url.toString(), cookies)
-
     def setUrl(self, url):
+        self.pending_url = None
         cookies = self.cookie_jar.load_cookies(url.toString())
         for cookie in cookies:
             self.cookie_store.setCookie(cookie, url)
         super().setUrl(url)
 
+    def defer_url(self, url):
+        # Remember the URL without starting a renderer; activate() loads it
+        self.pending_url = url
+
+    def current_url(self):
+        return self.pending_url if self.pending_url is not None else self.url()
+
+    def activate(self):
+        self.last_active = time.monotonic()
+        if self.pending_url is not None:
+            self.setUrl(self.pending_url)
+            get_tab_lifecycle().check()
+        elif self.page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            # Discarded pages reload from their last URL here
+            self.page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+
 class EnhancedTabWidget(QTabWidget):
+    tabs_changed = pyqtSignal()  # a tab was added, removed, moved or navigated
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
         self.setTabsClosable(True)
         self.tabCloseRequested.connect(self.close_tab)
+        self.currentChanged.connect(self.activate_current_tab)
+        self.tabBar().tabMoved.connect(lambda source, destination: self.tabs_changed.emit())
+        get_tab_lifecycle().register(self)
 
-        self.download_manager = DownloadManager(self)
-        self.cookie_jar = CustomCookieJar("AI-Garage")
-        
-        # Create a profile
-        self.profile = QWebEngineProfile("AI-Garage", self)
-        self.profile.downloadRequested.connect(self.download_manager.handle_download)
-
-    def create_web_tab(self, name, url):
-        web_view = EnhancedWebEngineView(self.profile, self.cookie_jar, self)
-        web_view.setUrl(QUrl(url))
-
-        index = self.addTab(web_view, name)
-        self.setCurrentIndex(index)
-        return web_view
-
-    def create_persistent_profile(self, retries=5):
-        persistent_path = get_persistent_storage_path()
-        for attempt in range(retries):
-            try:
-                self.persistent_profile = QWebEngineProfile("AI-Garage", self)
-                self.persistent_profile.setPersistentStoragePath(persistent_path)
-                self.persistent_profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies)
-                self.persistent_profile.downloadRequested.connect(self.download_manager.handle_download)
-                
-                # Force the profile to initialize its databases
-                self.persistent_profile.httpCacheType()
-                break
-            except Exception as e:
-                print(f"Attempt {attempt + 1} failed: {str(e)}")
-                if attempt < retries - 1:
-                    time.sleep(1)  # Wait for a second before retrying
-                else:
-                    print("Failed to create persistent profile after multiple attempts.")
-                    # Fallback to a non-persistent profile
-                    self.persistent_profile = QWebEngineProfile(self)
+        self.cookie_jar = get_shared_cookie_jar()
+        self.profile = get_shared_profile()
 
     def show_context_menu(self, position):
         index = self.tabBar().tabAt(position)
@@ -139,28 +259,63 @@ class EnhancedTabWidget(QTabWidget):
 
     def reload_tab(self, index):
         widget = self.widget(index)
-        if isinstance(widget, QWebEngineView):
+        if isinstance(widget, EnhancedWebEngineView) and widget.pending_url is not None:
+            widget.activate()
+        elif isinstance(widget, QWebEngineView):
             widget.reload()
 
     def open_in_external_browser(self, index):
         widget = self.widget(index)
-        if isinstance(widget, QWebEngineView):
+        if isinstance(widget, EnhancedWebEngineView):
+            url = widget.current_url().toString()
+            QDesktopServices.openUrl(QUrl(url))
+        elif isinstance(widget, QWebEngineView):
             url = widget.url().toString()
             QDesktopServices.openUrl(QUrl(url))
 
     def close_tab(self, index):
+        widget = self.widget(index)
         self.removeTab(index)
+        if widget is not None:
+            widget.deleteLater()  # removeTab alone leaves the renderer running
+
+    def clear_tabs(self):
+        # Like clear(), but also deletes the views so their renderers go away
+        while self.count() > 0:
+            self.close_tab(0)
 
     def create_web_tab(self, name, url):
+        # Tabs start unloaded and load the first time they are shown
         web_view = EnhancedWebEngineView(self.profile, self.cookie_jar, self)
-        web_view.setUrl(QUrl(url))
+        web_view.defer_url(QUrl(url))
 
         index = self.addTab(web_view, name)
         self.setCurrentIndex(index)
         return web_view
 
+    def tabInserted(self, index):
+        super().tabInserted(index)
+        widget = self.widget(index)
+        if isinstance(widget, QWebEngineView) and not getattr(widget, 'tracks_tab_changes', False):
+            widget.tracks_tab_changes = True
+            widget.urlChanged.connect(lambda url: self.tabs_changed.emit())
+        self.tabs_changed.emit()
+
+    def tabRemoved(self, index):
+        super().tabRemoved(index)
+        self.tabs_changed.emit()
+
+    def activate_current_tab(self, index=None):
+        widget = self.currentWidget()
+        if isinstance(widget, EnhancedWebEngineView) and self.isVisible():
+            widget.activate()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.activate_current_tab()
+
     def create_new_tab_with_page(self, new_page):
-        new_view = EnhancedWebEngineView(self.persistent_profile, self)
+        new_view = EnhancedWebEngineView(self.profile, self.cookie_jar, self)
         new_view.setPage(new_page)
         index = self.addTab(new_view, "New Tab")
         self.setCurrentIndex(index)
@@ -170,6 +325,8 @@ def get_tab_data(tab_widget):
     tab_data = []
     for i in range(tab_widget.count()):
         web_view = tab_widget.widget(i)
-        if isinstance(web_view, QWebEngineView):
+        if isinstance(web_view, EnhancedWebEngineView):
+            tab_data.append((tab_widget.tabText(i), web_view.current_url().toString()))
+        elif isinstance(web_view, QWebEngineView):
             tab_data.append((tab_widget.tabText(i), web_view.url().toString()))
     return tab_data
\ No newline at end of file
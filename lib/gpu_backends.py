@@ -0,0 +1,322 @@
+import os
+import re
+import glob
+import json
+import time
+import threading
+import subprocess
+from typing import NamedTuple, Optional
+from lib.hwmon import SysfsFile, open_temperature_sensor
+from lib.hardware import drm_card_number, pci_device_name
+
+DEFAULT_SAMPLE_MS = 1000
+RESTART_DELAY = 1  # seconds, doubled after each quick failure
+MAX_RESTART_DELAY = 60
+
+GPU_VENDOR_IDS = {
+    'NVIDIA': '0x10de',
+    'AMD': '0x1002',
+    'Intel': '0x8086',
+}
+
+class GPUReading(NamedTuple):
+    # One device's values for one tick; None means the backend can't report that value
+    name: str = "GPU"
+    usage: float = 0
+    clock_mhz: Optional[int] = None
+    temperature: Optional[float] = None
+    vram_used: Optional[int] = None
+    vram_total: Optional[int] = None
+
+def read_sysfs(path):
+    with open(path, 'r') as f:
+        return f.read().strip()
+
+def open_sysfs_file(path):
+    try:
+        return SysfsFile(path)
+    except OSError:
+        return None
+
+def close_all(files):
+    for f in files:
+        if f is not None:
+            f.close()
+
+def read_value(values, key, read, *errors):
+    # Fills values[key] from read(); a file that is missing or unreadable leaves it unset
+    try:
+        values[key] = read()
+    except (OSError, ValueError, AttributeError) + errors:
+        pass
+
+def find_drm_devices(vendor, sysfs_root='/sys'):
+    # [(card name, device directory)] of every DRM card from `vendor`, e.g. ('card1', '/sys/class/drm/card1/device')
+    vendor_id = GPU_VENDOR_IDS[vendor]
+    cards = sorted((path for path in glob.glob(os.path.join(sysfs_root, 'class/drm/card*'))
+                    if re.search(r'card\d+$', path)), key=drm_card_number)
+    devices = []
+    seen = set()
+    for card in cards:
+        device = os.path.join(card, 'device')
+        real_device = os.path.realpath(device)
+        if real_device in seen:
+            continue
+        try:
+            if read_sysfs(os.path.join(device, 'vendor')) != vendor_id:
+                continue
+        except OSError:
+            continue
+        seen.add(real_device)
+        devices.append((os.path.basename(card), device))
+    return devices
+
+def drm_device_name(vendor, device, card):
+    try:
+        return read_sysfs(os.path.join(device, 'product_name'))
+    except OSError:
+        pass
+    try:
+        name = pci_device_name(GPU_VENDOR_IDS[vendor], read_sysfs(os.path.join(device, 'device')))
+    except OSError:
+        name = None
+    return name or f"{vendor} {card}"
+
+class NullBackend:
+    # Used when no vendor backend could start, so there are no GPU gauges
+    name = "none"
+
+    def sample(self):
+        return ()
+
+    def close(self):
+        pass
+
+class NvmlBackend:
+    # Initializes NVML once and keeps a handle for every device for the life of the backend
+    name = "nvml"
+
+    def __init__(self):
+        import pynvml
+        self.nvml = pynvml
+        pynvml.nvmlInit()
+        self.devices = []
+        for index in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+            name = pynvml.nvmlDeviceGetName(handle)
+            self.devices.append((name.decode() if isinstance(name, bytes) else name, handle))
+        if not self.devices:
+            pynvml.nvmlShutdown()
+            raise RuntimeError("no NVIDIA devices found")
+
+    def sample_device(self, name, handle):
+        nvml = self.nvml
+        values = {'name': name}
+        read_value(values, 'usage', lambda: nvml.nvmlDeviceGetUtilizationRates(handle).gpu, nvml.NVMLError)
+        read_value(values, 'clock_mhz', lambda: nvml.nvmlDeviceGetClockInfo(handle, nvml.NVML_CLOCK_GRAPHICS), nvml.NVMLError)
+        read_value(values, 'temperature', lambda: nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU), nvml.NVMLError)
+        try:
+            memory = nvml.nvmlDeviceGetMemoryInfo(handle)
+            values['vram_used'], values['vram_total'] = memory.used, memory.total
+        except nvml.NVMLError:
+            pass
+        return GPUReading(**values)
+
+    def sample(self):
+        return tuple(self.sample_device(name, handle) for name, handle in self.devices)
+
+    def close(self):
+        try:
+            self.nvml.nvmlShutdown()
+        except self.nvml.NVMLError:
+            pass
+
+class AmdGpu:
+    # One amdgpu card; its sysfs files stay open between samples
+    def __init__(self, card, device):
+        self.name = drm_device_name('AMD', device, card)
+        self.busy_file = open_sysfs_file(os.path.join(device, 'gpu_busy_percent'))
+        self.sclk_file = open_sysfs_file(os.path.join(device, 'pp_dpm_sclk'))
+        self.vram_used_file = open_sysfs_file(os.path.join(device, 'mem_info_vram_used'))
+        self.vram_total_file = open_sysfs_file(os.path.join(device, 'mem_info_vram_total'))
+        self.temp_sensor = open_temperature_sensor([('amdgpu', 'edge')], os.path.join(device, 'hwmon'))
+
+    def read_clock(self):
+        # pp_dpm_sclk lists the clock states; the active one is starred ("1: 1800Mhz *")
+        for line in self.sclk_file.read().splitlines():
+            if '*' in line:
+                match = re.search(r'(\d+)\s*Mhz', line, re.IGNORECASE)
+                return int(match.group(1)) if match else None
+        return None
+
+    def sample(self):
+        values = {'name': self.name}
+        read_value(values, 'usage', lambda: float(self.busy_file.read()))
+        read_value(values, 'clock_mhz', self.read_clock)
+        read_value(values, 'temperature', lambda: self.temp_sensor.read_celsius())
+        read_value(values, 'vram_used', lambda: int(self.vram_used_file.read()))
+        read_value(values, 'vram_total', lambda: int(self.vram_total_file.read()))
+        return GPUReading(**values)
+
+    def close(self):
+        close_all([self.busy_file, self.sclk_file, self.vram_used_file, self.vram_total_file, self.temp_sensor])
+
+class AmdSysfsBackend:
+    # Every amdgpu card in sysfs; sysfs_root lets it run against a fake tree
+    name = "amdgpu"
+
+    def __init__(self, sysfs_root='/sys'):
+        self.devices = [AmdGpu(card, device) for card, device in find_drm_devices('AMD', sysfs_root)
+                        if os.path.exists(os.path.join(device, 'gpu_busy_percent'))]
+        if not self.devices:
+            raise RuntimeError("no amdgpu device found")
+
+    def sample(self):
+        return tuple(device.sample() for device in self.devices)
+
+    def close(self):
+        for device in self.devices:
+            device.close()
+
+class IntelGpuTopReader:
+    # Runs one long-lived `intel_gpu_top -J -s <ms>` and parses its JSON stream on a
+    # background thread; readers just take the latest busy percentage
+    def __init__(self, interval_ms=DEFAULT_SAMPLE_MS, command='intel_gpu_top', device_filter=None):
+        self.interval_ms = interval_ms
+        self.command = command
+        self.device_filter = device_filter
+        self.busy = 0
+        self.updated = 0
+        self.process = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="intel_gpu_top", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    def read_busy(self):
+        # A dead or stalled child reads as idle rather than freezing the last value
+        if time.monotonic() - self.updated > 3 * self.interval_ms / 1000:
+            return 0
+        return self.busy
+
+    def on_sample(self, sample):
+        for engine, stats in sample.get('engines', {}).items():
+            # 'Render/3D/0' on older releases, 'Render/3D' on newer ones
+            if engine.startswith('Render/3D'):
+                self.busy = stats.get('busy', 0)
+                self.updated = time.monotonic()
+                return
+
+    def parse_stream(self, stream):
+        # The output is one JSON array that never closes, so decode each object as it completes
+        decoder = json.JSONDecoder()
+        buffer = ''
+        for line in stream:
+            buffer += line
+            if '}' not in line:
+                continue
+            while True:
+                buffer = buffer.lstrip(' \t\r\n[,')
+                if not buffer:
+                    break
+                try:
+                    sample, end = decoder.raw_decode(buffer)
+                except ValueError:
+                    break  # Object not complete yet
+                buffer = buffer[end:]
+                if isinstance(sample, dict):
+                    self.on_sample(sample)
+
+    def run(self):
+        delay = RESTART_DELAY
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            args = [self.command, '-J', '-s', str(self.interval_ms)]
+            if self.device_filter:
+                args += ['-d', self.device_filter]
+            try:
+                self.process = subprocess.Popen(args,
+                                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            except OSError as e:
+                print(f"Unable to start {self.command}: {e}")
+                return  # Not installed; restarting won't help
+            try:
+                self.parse_stream(self.process.stdout)
+            except Exception as e:
+                print(f"Error reading {self.command}: {e}")
+            finally:
+                if self.process.poll() is None:
+                    self.process.terminate()
+                self.process.wait()
+            if self.stop_event.is_set():
+                break
+            # Back off when it keeps dying straight away (e.g. missing perf permissions)
+            delay = RESTART_DELAY if time.monotonic() - started > MAX_RESTART_DELAY else min(delay * 2, MAX_RESTART_DELAY)
+            print(f"{self.command} exited, restarting in {delay}s")
+            self.stop_event.wait(delay)
+
+class IntelGpu:
+    # One Intel card: clock from i915 sysfs, busy percentage from a persistent intel_gpu_top
+    def __init__(self, card, device, interval_ms, device_filter=None):
+        self.name = drm_device_name('Intel', device, card)
+        self.freq_file = open_sysfs_file(os.path.join(os.path.dirname(device), 'gt_act_freq_mhz'))
+        self.temp_sensor = open_temperature_sensor([('i915', None), ('xe', None)], os.path.join(device, 'hwmon'))
+        self.gpu_top = IntelGpuTopReader(interval_ms, device_filter=device_filter)
+        self.gpu_top.start()
+
+    def sample(self):
+        values = {'name': self.name, 'usage': self.gpu_top.read_busy()}
+        read_value(values, 'clock_mhz', lambda: int(self.freq_file.read()))
+        read_value(values, 'temperature', lambda: self.temp_sensor.read_celsius())
+        return GPUReading(**values)
+
+    def close(self):
+        self.gpu_top.stop()
+        close_all([self.freq_file, self.temp_sensor])
+
+class IntelBackend:
+    name = "intel"
+
+    def __init__(self, sysfs_root='/sys', interval_ms=DEFAULT_SAMPLE_MS):
+        cards = find_drm_devices('Intel', sysfs_root)
+        if not cards:
+            raise RuntimeError("no Intel GPU found")
+        # intel_gpu_top watches the first GPU unless told otherwise
+        multiple = len(cards) > 1
+        self.devices = [IntelGpu(card, device, interval_ms, f"drm:/dev/dri/{card}" if multiple else None)
+                        for card, device in cards]
+
+    def sample(self):
+        return tuple(device.sample() for device in self.devices)
+
+    def close(self):
+        for device in self.devices:
+            device.close()
+
+GPU_BACKENDS = {
+    'NVIDIA': NvmlBackend,
+    'AMD': AmdSysfsBackend,
+    'Intel': IntelBackend,
+}
+
+def create_gpu_backend(gpu_type, sysfs_root='/sys', interval_ms=DEFAULT_SAMPLE_MS):
+    # Never raises: a missing library or device falls back to NullBackend
+    backend_class = GPU_BACKENDS.get(gpu_type)
+    if backend_class is None:
+        return NullBackend()
+    try:
+        if backend_class is NvmlBackend:
+            return backend_class()
+        if backend_class is IntelBackend:
+            return backend_class(sysfs_root=sysfs_root, interval_ms=interval_ms)
+        return backend_class(sysfs_root=sysfs_root)
+    except Exception as e:
+        print(f"GPU backend for {gpu_type} unavailable: {e}")
+        return NullBackend()
@@ -0,0 +1,269 @@
+import os
+import re
+import glob
+import json
+import hashlib
+import platform
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+HARDWARE_CACHE_FILE = os.path.join('cache', 'hardware.json')
+PCI_IDS_FILES = ['/usr/share/hwdata/pci.ids', '/usr/share/misc/pci.ids', '/usr/share/pci.ids']
+DISK_PREFIXES = ('sd', 'nvme', 'vd', 'hd', 'mmcblk')
+
+GPU_VENDORS = {
+    '0x10de': 'NVIDIA',
+    '0x1002': 'AMD',
+    '0x8086': 'Intel',
+}
+
+def read_file(path, default=None):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+def get_boot_id():
+    return read_file('/proc/sys/kernel/random/boot_id', '')
+
+def drm_card_number(path):
+    return int(re.search(r'\d+$', path).group())
+
+def list_drm_cards():
+    # card0, card1, ... in numeric order (card2 before card10), but not their connectors (card0-DP-1, ...)
+    return sorted((path for path in glob.glob('/sys/class/drm/card*') if re.search(r'card\d+$', path)),
+                  key=drm_card_number)
+
+def list_disks():
+    return sorted(name for name in os.listdir('/sys/block') if name.startswith(DISK_PREFIXES)) \
+        if os.path.isdir('/sys/block') else []
+
+def get_fingerprint():
+    # Cheap identifiers that change when hotpluggable hardware does (eGPUs, drives)
+    parts = []
+    for card in list_drm_cards():
+        parts.append(f"{os.path.basename(card)}={read_file(card + '/device/vendor')}:{read_file(card + '/device/device')}")
+    for disk in list_disks():
+        parts.append(f"{disk}={read_file(f'/sys/block/{disk}/size')}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+def probe_cpu():
+    model = None
+    cores = set()
+    physical_id = None
+    for line in (read_file('/proc/cpuinfo', '') or '').splitlines():
+        key, _, value = line.partition(':')
+        key, value = key.strip(), value.strip()
+        if key == 'model name' and model is None:
+            model = value
+        elif key == 'physical id':
+            physical_id = value
+        elif key == 'core id':
+            cores.add((physical_id, value))
+
+    max_khz = read_file('/sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq')
+    return {
+        'model': model or platform.processor(),
+        'cores': len(cores) or os.cpu_count(),
+        'threads': os.cpu_count(),
+        'max_ghz': int(max_khz) / 1e6 if max_khz else None,
+    }
+
+def pci_device_name(vendor_id, device_id):
+    # Look the device up in the pci.ids database, the same source lspci uses
+    vendor = vendor_id.replace('0x', '').lower()
+    device = device_id.replace('0x', '').lower()
+    for pci_ids in PCI_IDS_FILES:
+        try:
+            with open(pci_ids, 'r', errors='replace') as f:
+                in_vendor = False
+                for line in f:
+                    if line.startswith('#') or not line.strip():
+                        continue
+                    if not line.startswith('\t'):
+                        if in_vendor:
+                            return None
+                        in_vendor = line.startswith(vendor + '  ')
+                    elif in_vendor and line.startswith('\t' + device + '  '):
+                        return line.strip()[len(device):].strip()
+        except OSError:
+            continue
+    return None
+
+def probe_nvidia_gpus():
+    # The driver doesn't expose VRAM in /proc or /sys, so ask nvidia-smi once
+    try:
+        output = subprocess.check_output(['nvidia-smi', '--query-gpu=name,memory.total',
+                                          '--format=csv,noheader,nounits'], text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return []
+    gpus = []
+    for line in output.strip().splitlines():
+        name, _, memory = line.partition(',')
+        try:
+            vram_gb = int(memory) / 1024
+        except ValueError:
+            vram_gb = None
+        gpus.append({'vendor': 'NVIDIA', 'name': name.strip(), 'vram_gb': vram_gb})
+    return gpus
+
+def probe_gpus():
+    gpus = []
+    seen = set()
+    nvidia_found = False
+    for card in list_drm_cards():
+        device_path = os.path.realpath(card + '/device')
+        if device_path in seen:
+            continue
+        seen.add(device_path)
+        vendor_id = read_file(device_path + '/vendor')
+        vendor = GPU_VENDORS.get(vendor_id)
+        if vendor is None:
+            continue
+        if vendor == 'NVIDIA':
+            nvidia_found = True
+            continue
+        device_id = read_file(device_path + '/device', '')
+        name = read_file(device_path + '/product_name') or pci_device_name(vendor_id, device_id) \
+            or f"GPU {device_id}"
+        vram = read_file(device_path + '/mem_info_vram_total')
+        gpus.append({'vendor': vendor, 'name': name, 'vram_gb': int(vram) / 1024**3 if vram else None})
+
+    # The proprietary NVIDIA driver may not register a DRM card, so also check /proc
+    if nvidia_found or os.path.isdir('/proc/driver/nvidia/gpus'):
+        gpus = probe_nvidia_gpus() + gpus
+    return gpus
+
+def probe_memory():
+    for line in (read_file('/proc/meminfo', '') or '').splitlines():
+        if line.startswith('MemTotal:'):
+            return int(line.split()[1]) * 1024
+    return 0
+
+def probe_disks():
+    disks = []
+    for disk in list_disks():
+        sectors = read_file(f'/sys/block/{disk}/size')
+        if not sectors or int(sectors) == 0:
+            continue
+        disks.append({
+            'device': f'/dev/{disk}',
+            'model': read_file(f'/sys/block/{disk}/device/model', ''),
+            'size_bytes': int(sectors) * 512,  # /sys/block sizes are always in 512-byte sectors
+        })
+    return disks
+
+def probe_os():
+    os_release = read_file('/etc/os-release', '') or ''
+    pretty_name = re.search(r'PRETTY_NAME="?(.*?)"?$', os_release, re.MULTILINE)
+    return {
+        'name': pretty_name.group(1) if pretty_name else platform.system(),
+        'kernel': platform.release(),
+    }
+
+def probe_hardware():
+    # Each probe is independent, so run them side by side
+    probes = {'cpu': probe_cpu, 'gpus': probe_gpus, 'memory_bytes': probe_memory,
+              'disks': probe_disks, 'os': probe_os}
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = {name: executor.submit(probe) for name, probe in probes.items()}
+    inventory = {}
+    for name, future in futures.items():
+        try:
+            inventory[name] = future.result()
+        except Exception as e:
+            print(f"Hardware probe '{name}' failed: {e}")
+            inventory[name] = None
+    return inventory
+
+def load_cached_inventory():
+    # Only valid for the same boot and the same set of GPUs/drives
+    try:
+        with open(HARDWARE_CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('boot_id') != get_boot_id() or cached.get('fingerprint') != get_fingerprint():
+        return None
+    return cached.get('inventory')
+
+def save_inventory(inventory):
+    os.makedirs(os.path.dirname(HARDWARE_CACHE_FILE), exist_ok=True)
+    tmp_file = HARDWARE_CACHE_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump({'boot_id': get_boot_id(), 'fingerprint': get_fingerprint(), 'inventory': inventory}, f)
+    os.replace(tmp_file, HARDWARE_CACHE_FILE)
+
+def get_hardware_inventory():
+    inventory = load_cached_inventory()
+    if inventory is None:
+        inventory = probe_hardware()
+        try:
+            save_inventory(inventory)
+        except OSError as e:
+            print(f"Unable to cache hardware inventory: {e}")
+    return inventory
+
+def format_size(size_bytes):
+    size_gb = size_bytes / 1024**3
+    return f"{size_gb / 1024:.2f}TB" if size_gb > 1024 else f"{size_gb:.0f}GB"
+
+def list_partitions(disk):
+    # sda -> {'sda', 'sda1', 'sda2'}; partitions are the /sys/block/<disk>/ entries with a 'partition' file
+    names = {disk}
+    disk_path = f'/sys/block/{disk}'
+    if os.path.isdir(disk_path):
+        for name in os.listdir(disk_path):
+            if os.path.exists(os.path.join(disk_path, name, 'partition')):
+                names.add(name)
+    return names
+
+def get_disk_used(device):
+    # Usage changes all the time, so it is never cached: sum every mounted partition of the disk.
+    # Each partition is counted once, even when it is mounted several times (btrfs subvolumes, bind mounts)
+    sources = {f'/dev/{name}' for name in list_partitions(os.path.basename(device))}
+    used = 0
+    counted = set()
+    for line in (read_file('/proc/self/mounts', '') or '').splitlines():
+        source, mountpoint = line.split()[:2]
+        if source not in sources or source in counted:
+            continue
+        try:
+            stat = os.statvfs(mountpoint.replace('\\040', ' '))
+        except OSError:
+            continue
+        counted.add(source)
+        used += (stat.f_blocks - stat.f_bfree) * stat.f_frsize
+    return used
+
+def format_cpu(cpu):
+    if not cpu:
+        return platform.processor()
+    freq = f" @ {cpu['max_ghz']:.3f}GHz" if cpu.get('max_ghz') else ""
+    if "AMD Ryzen" in cpu['model']:
+        return f"{cpu['model']}\n({cpu['threads']}Threads){freq}"
+    return f"{cpu['model']}\n({cpu['cores']} cores, {cpu['threads']} threads){freq}"
+
+def format_gpu(gpu):
+    vram = f" {gpu['vram_gb']:.0f}GB" if gpu.get('vram_gb') else ""
+    name = gpu['name'] if gpu['name'].startswith(gpu['vendor']) else f"{gpu['vendor']} {gpu['name']}"
+    return f"{name}{vram}"
+
+def format_system_info(inventory):
+    gpus = inventory.get('gpus')
+    gpu_info = "\n".join(format_gpu(gpu) for gpu in gpus) if gpus else "GPU information not available"
+
+    disks = inventory.get('disks') or []
+    disk_info = "\n".join(f"{disk['device']}: {format_size(get_disk_used(disk['device']))}/{format_size(disk['size_bytes'])}"
+                          for disk in disks) or "Disk information unavailable"
+
+    os_info = inventory.get('os') or {'name': platform.system(), 'kernel': platform.release()}
+
+    info_text = f"Detected System Specs:\n"
+    info_text += f"{format_cpu(inventory.get('cpu'))}\n\n"
+    info_text += f"{gpu_info}\n\n"
+    info_text += f"{(inventory.get('memory_bytes') or 0) / 1024**3:.1f} GB System RAM\n\n"
+    info_text += f"Disks:\n{disk_info}\n\n"
+    info_text += f"OS: {os_info['name']}\nKernel: {os_info['kernel']}"
+    return info_text
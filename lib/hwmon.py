@@ -0,0 +1,72 @@
+import os
+import glob
+
+HWMON_ROOT = '/sys/class/hwmon'
+
+# (hwmon driver name, temp*_label) in order of preference; None matches temp1 of unlabelled drivers
+CPU_TEMPERATURE_SENSORS = [
+    ('k10temp', 'Tctl'),
+    ('zenpower', 'Tctl'),
+    ('coretemp', 'Package id 0'),
+    ('cpu_thermal', None),
+]
+
+class SysfsFile:
+    # Keeps a sysfs attribute open; pread at offset 0 makes the kernel regenerate the value,
+    # so each read is one syscall with no open/close or path lookup
+    def __init__(self, path, size=4096):
+        self.path = path
+        self.size = size
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def read(self):
+        return os.pread(self.fd, self.size, 0).decode(errors='replace').strip()
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+class TemperatureSensor(SysfsFile):
+    def __init__(self, path):
+        super().__init__(path, size=32)
+
+    def read_celsius(self):
+        # temp*_input is in millidegrees
+        return int(self.read()) / 1000
+
+def read_text(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def find_temperature_input(candidates, hwmon_root=HWMON_ROOT):
+    # Returns the temp*_input path of the first (name, label) candidate present under hwmon_root
+    chips = {}
+    for chip in sorted(glob.glob(os.path.join(hwmon_root, 'hwmon*'))):
+        chips.setdefault(read_text(os.path.join(chip, 'name')), []).append(chip)
+
+    for name, label in candidates:
+        for chip in chips.get(name, []):
+            if label is None:
+                path = os.path.join(chip, 'temp1_input')
+                if os.path.exists(path):
+                    return path
+                continue
+            for label_file in sorted(glob.glob(os.path.join(chip, 'temp*_label'))):
+                if read_text(label_file) == label:
+                    return label_file[:-len('_label')] + '_input'
+    return None
+
+def open_temperature_sensor(candidates, hwmon_root=HWMON_ROOT):
+    # Discovery runs once; returns None when no candidate exists or it can't be opened
+    path = find_temperature_input(candidates, hwmon_root)
+    if path is None:
+        return None
+    try:
+        return TemperatureSensor(path)
+    except OSError as e:
+        print(f"Unable to open temperature sensor {path}: {e}")
+        return None
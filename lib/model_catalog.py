@@ -0,0 +1,85 @@
+import os
+import json
+import time
+from PyQt6.QtCore import QObject, pyqtSignal
+from lib.ollama_client import get_ollama_client
+from lib.workers import ProviderRequest, start_request
+
+CATALOG_CACHE_FILE = os.path.join('cache', 'ollama_models.json')
+DEFAULT_TTL = 60  # seconds
+
+class ModelCatalog(QObject):
+    models_changed = pyqtSignal(list)
+    refresh_failed = pyqtSignal(str)
+    refresh_finished = pyqtSignal()  # After every successful fetch, changed or not
+
+    def __init__(self, config, server_address, ttl=DEFAULT_TTL):
+        super().__init__()
+        self.config = config
+        self.server_address = server_address
+        self.ttl = ttl
+        self.fetched_at = 0
+        self.pending_request = None
+        self.models = self.read_cache()
+
+    def read_cache(self):
+        # Seed from the last known list so the UI can render before the first fetch
+        try:
+            with open(CATALOG_CACHE_FILE, 'r') as f:
+                cached = json.load(f)
+            return cached.get(self.server_address, [])
+        except (OSError, ValueError):
+            return []
+
+    def write_cache(self):
+        try:
+            with open(CATALOG_CACHE_FILE, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        cached[self.server_address] = self.models
+        os.makedirs(os.path.dirname(CATALOG_CACHE_FILE), exist_ok=True)
+        tmp_file = CATALOG_CACHE_FILE + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(cached, f)
+        os.replace(tmp_file, CATALOG_CACHE_FILE)
+
+    def is_stale(self):
+        return time.time() - self.fetched_at > self.ttl
+
+    def refresh(self, force=False):
+        # Fetch /api/tags on the worker pool; listeners hear about it via models_changed
+        if self.pending_request is not None or (not force and not self.is_stale()):
+            return
+        client = get_ollama_client(self.config, self.server_address)
+        self.pending_request = ProviderRequest(client.list_models)
+        self.pending_request.signals.finished.connect(self.on_refresh_finished)
+        self.pending_request.signals.failed.connect(self.on_refresh_failed)
+        start_request(self.pending_request)
+
+    def on_refresh_finished(self, request_id, models):
+        self.pending_request = None
+        self.fetched_at = time.time()
+        if models != self.models:
+            self.models = models
+            self.write_cache()
+            self.models_changed.emit(list(models))
+        self.refresh_finished.emit()
+
+    def on_refresh_failed(self, request_id, error):
+        self.pending_request = None
+        self.fetched_at = time.time()
+        self.refresh_failed.emit(error)
+
+_catalogs = {}
+
+def get_model_catalog(config, server_address=None):
+    if server_address is None:
+        server_address = config['Settings'].get('OllamaServer', '')
+    catalog = _catalogs.get(server_address)
+    if catalog is None:
+        catalog = ModelCatalog(config, server_address,
+                               config.getint('Ollama', 'ModelCacheTTL', fallback=DEFAULT_TTL))
+        _catalogs[server_address] = catalog
+    catalog.refresh()
+    return catalog
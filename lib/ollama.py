@@ -2,90 +2,107 @@ import json
 from PyQt6.QtWidgets import (QLabel, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QWidget, QLineEdit, QListWidget, QListWidgetItem, QMessageBox,
                              QRadioButton, QButtonGroup)
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, pyqtSignal
 from lib.chat import AIServiceWidget
-import requests
+from lib.context_builder import build_context, get_context_budget
+from lib.ollama_client import get_ollama_client
+from lib.model_catalog import get_model_catalog
 
 class OllamaWidget(AIServiceWidget):
+    response_metadata = pyqtSignal(dict)  # final /api/chat chunk (durations, token counts)
+
     def __init__(self, config, server_address):
         self.config = config
         self.server_address = server_address
+        self.client = get_ollama_client(config, server_address)
+        self.catalog = get_model_catalog(config, server_address)
+        self.last_response_metadata = {}
         super().__init__(None)  # Ollama doesn't need an API key
 
     def get_models(self):
-        try:
-            response = requests.get(f"{self.server_address}/api/tags")
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                return [model["name"] for model in models]
-        except requests.RequestException:
-            pass
-        return []
+        return self.catalog.models
 
     def setup_model_selection(self, layout):
         self.model_group = QButtonGroup(self)
-        models = self.get_models()
+        self.model_buttons_layout = QHBoxLayout()
+        layout.addLayout(self.model_buttons_layout)
+        self.populate_models(self.get_models())
+        self.catalog.models_changed.connect(self.populate_models)
+
+    def populate_models(self, models):
+        # Rebuild the radio buttons from the catalog, keeping the current choice if it still exists
+        checked = self.model_group.checkedButton()
+        selected_model = checked.text() if checked else None
+        while self.model_buttons_layout.count():
+            widget = self.model_buttons_layout.takeAt(0).widget()
+            if widget:
+                if isinstance(widget, QRadioButton):
+                    self.model_group.removeButton(widget)
+                widget.deleteLater()
+
+        layout = self.model_buttons_layout
         for i, model in enumerate(models):
             radio = QRadioButton(model)
-            radio.setStyleSheet("""
-                QRadioButton {
-                    color: white;
-                }
-                QRadioButton::indicator:checked {
-                    background-color: black;
-                    border: 2px solid white;
-                }
-            """)
             self.model_group.addButton(radio, i)
             layout.addWidget(radio)
+            if model == selected_model:
+                radio.setChecked(True)
         if models:
-            self.model_group.button(0).setChecked(True)
+            if not self.model_group.checkedButton():
+                self.model_group.button(0).setChecked(True)
         else:
             layout.addWidget(QLabel("No models available"))
 
     def send_message(self):
         user_message = self.message_input.text()
-        if user_message:
+        if user_message and not self.active_requests:
             if not self.current_chat_id:
                 self.new_chat()
+                if not self.current_chat_id:
+                    return
 
             self.new_message.emit("user", user_message)
-            self.current_chat.append({"role": "user", "content": user_message})
-            self.update_chat_display()
+            self.add_message("user", user_message)
             self.message_input.clear()
 
             try:
                 model = self.model_group.checkedButton().text()
-                response = self.get_ollama_response(model, user_message)
-                self.new_message.emit("assistant", response)
-                self.current_chat.append({"role": "assistant", "content": response})
-                self.update_chat_display()
-                self.save_chat_history()
+                messages = build_context(self.current_chat, get_context_budget(self.config, model),
+                                         self.config.get('Ollama', 'SystemPrompt', fallback=''))
+                if self.respond_from_cache(model, messages):
+                    return
+                self.dispatch_request(self.get_ollama_response, model, messages, stream=True)
             except Exception as e:
                 self.show_error_message(str(e))
 
-    def get_ollama_response(self, model, message):
-        url = f"{self.server_address}/api/chat"
-        data = {
-            "model": model,
-            "messages": [{"role": "user", "content": message}],
-            "stream": True
-        }
-        try:
-            response = requests.post(url, json=data, stream=True)
-            response.raise_for_status()
-            full_response = ""
+    def on_request_finished(self, chat_id, result):
+        response, metadata = result
+        self.last_response_metadata = metadata
+        self.response_metadata.emit(metadata)
+        super().on_request_finished(chat_id, response)
+
+    def get_ollama_response(self, model, messages, on_chunk=None):
+        # Returns (response text, metadata from the final "done" chunk). Any failure
+        # raises, so it reaches on_request_failed and is never saved as a reply
+        parts = []
+        metadata = {}
+        with self.client.chat(model, messages, stream=True) as response:
             for line in response.iter_lines():
                 if line:
                     json_response = json.loads(line)
+                    if 'error' in json_response:
+                        raise RuntimeError(f"Ollama error: {json_response['error']}")
                     if 'message' in json_response:
                         content = json_response['message'].get('content', '')
-                        full_response += content
-            return full_response.strip()
-        except requests.RequestException as e:
-            return f"Error: {str(e)}"
-        except json.JSONDecodeError as e:
-            return f"Error parsing response: {str(e)}"
+                        if content:
+                            parts.append(content)
+                            if on_chunk:
+                                on_chunk(content)
+                    if json_response.get('done'):
+                        metadata = {k: v for k, v in json_response.items() if k != 'message'}
+        if not metadata:
+            raise RuntimeError("Ollama closed the stream before the response was complete")
+        return "".join(parts).strip(), metadata
 
 def setup_ollama_section(config, parent):
     ollama_group = QWidget()
@@ -95,44 +112,35 @@ def setup_ollama_section(config, parent):
     server_layout = QHBoxLayout()
     server_layout.addWidget(QLabel("Server:"))
     ollama_server_input = QLineEdit(config['Settings'].get('OllamaServer', ''))
-    ollama_server_input.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+    ollama_server_input.setProperty("surface", "glass")
     server_layout.addWidget(ollama_server_input)
     ollama_layout.addLayout(server_layout)
 
     # Model list
     ollama_model_list = QListWidget()
-    ollama_model_list.setStyleSheet("""
-        QListWidget {
-            background-color: rgba(255, 255, 255, 10);
-            color: white;
-        }
-        QListWidget::item {
-            padding: 5px;
-        }
-    """)
+    ollama_model_list.setProperty("surface", "tint")
     ollama_layout.addWidget(ollama_model_list)
 
     refresh_button = QPushButton("Refresh Models")
     refresh_button.clicked.connect(lambda: refresh_ollama_models(config, ollama_model_list))
-    refresh_button.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+    refresh_button.setProperty("surface", "glass")
     ollama_layout.addWidget(refresh_button)
 
-    refresh_ollama_models(config, ollama_model_list)
+    catalog = get_model_catalog(config)
+    catalog.models_changed.connect(lambda models: populate_model_list(ollama_model_list, models))
+    populate_model_list(ollama_model_list, catalog.models)
 
     return ollama_group, ollama_model_list
 
 def refresh_ollama_models(config, model_list):
+    catalog = get_model_catalog(config)
+    populate_model_list(model_list, catalog.models)
+    catalog.refresh(force=True)
+
+def populate_model_list(model_list, models):
     model_list.clear()
-    server_address = config['Settings'].get('OllamaServer', '')
-    try:
-        response = requests.get(f"{server_address}/api/tags")
-        if response.status_code == 200:
-            models = response.json().get("models", [])
-            for model in models:
-                item = QListWidgetItem(model["name"])
-                model_list.addItem(item)
-    except requests.RequestException:
-        pass
+    for model_name in models:
+        model_list.addItem(QListWidgetItem(model_name))
 
 def show_download_popup(model_name, parent):
     popup = QMessageBox(parent)
@@ -140,7 +148,6 @@ def show_download_popup(model_name, parent):
     popup.setText(f"Downloading {model_name}...")
     popup.setIcon(QMessageBox.Icon.Information)
     popup.setStandardButtons(QMessageBox.StandardButton.NoButton)
-    popup.setStyleSheet("color: white; background-color: #2d2d2d;")
     popup.show()
 
     # Simulate download progress
@@ -0,0 +1,65 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CONNECT_TIMEOUT = 3.0
+DEFAULT_READ_TIMEOUT = 300.0  # Generous: the first token can wait on a cold model load
+METADATA_READ_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+POOL_SIZE = 8
+
+class OllamaClient:
+    def __init__(self, server_address, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, retries=DEFAULT_RETRIES):
+        self.server_address = server_address.rstrip('/')
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        # Connection failures are retried for every request; read failures and
+        # 5xx only for idempotent calls, so a generation is never sent twice
+        retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                      backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(['GET', 'DELETE']))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def url(self, path):
+        return f"{self.server_address}{path}"
+
+    def list_models(self):
+        response = self.session.get(self.url("/api/tags"),
+                                    timeout=(self.connect_timeout, METADATA_READ_TIMEOUT))
+        response.raise_for_status()
+        return [model["name"] for model in response.json().get("models", [])]
+
+    def chat(self, model, messages, stream=True):
+        response = self.session.post(self.url("/api/chat"),
+                                     json={"model": model, "messages": messages, "stream": stream},
+                                     stream=stream, timeout=(self.connect_timeout, self.read_timeout))
+        response.raise_for_status()
+        return response
+
+    def delete_model(self, model_name):
+        return self.session.delete(self.url("/api/delete"), json={"name": model_name},
+                                   timeout=(self.connect_timeout, METADATA_READ_TIMEOUT))
+
+    def close(self):
+        self.session.close()
+
+_clients = {}
+
+def get_ollama_client(config, server_address=None):
+    # One pooled client per server address, shared by every Ollama caller
+    if server_address is None:
+        server_address = config['Settings'].get('OllamaServer', '')
+    client = _clients.get(server_address)
+    if client is None:
+        client = OllamaClient(
+            server_address,
+            connect_timeout=config.getfloat('Ollama', 'ConnectTimeout', fallback=DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=config.getfloat('Ollama', 'ReadTimeout', fallback=DEFAULT_READ_TIMEOUT),
+            retries=config.getint('Ollama', 'Retries', fallback=DEFAULT_RETRIES))
+        _clients[server_address] = client
+    return client
@@ -1,11 +1,9 @@
-import psutil
 import math
-import json
-import subprocess
 import configparser
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel
 from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QLinearGradient, QBrush
-from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF
+from PyQt6.QtCore import Qt, QRectF, QPointF
+from lib.telemetry import get_telemetry_sampler
 
 class Gauge(QWidget):
     def __init__(self, title, parent=None):
@@ -13,53 +11,20 @@ class Gauge(QWidget):
         self.setMinimumSize(200, 120)  # Reduced height
         self.value = 0
         self.title = title
-        self.initUI()
 
-    def initUI(self):
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.updateValue)
-        self.timer.start(1000)
-
-    def updateValue(self):
-        if self.title == "CPU":
-            self.value = psutil.cpu_percent()
-        elif self.title == "RAM":
-            self.value = psutil.virtual_memory().percent
-        elif self.title == "GPU":
-            self.value = self.get_gpu_usage()
-        self.update()
-
-    def get_gpu_usage(self):
-        gpu_type = self.parent().gpu_type
-        if gpu_type == "NVIDIA":
-            try:
-                import pynvml
-                pynvml.nvmlInit()
-                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                return util.gpu
-            except:
-                return 0
-        elif gpu_type == "AMD":
-            try:
-                with open('/sys/class/drm/card1/device/gpu_busy_percent', 'r') as f:
-                    return float(f.read().strip())
-            except:
-                return 0
-        elif gpu_type == "Intel":
-            try:
-                result = subprocess.run(['intel_gpu_top', '-J'], capture_output=True, text=True)
-                data = json.loads(result.stdout)
-                return data['engines']['Render/3D/0']['busy']
-            except:
-                return 0
-        return 0
+    def set_value(self, value):
+        if value != self.value:
+            self.value = value
+            self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        width = self.width()
-        height = self.height()
+        # Below the designed 200x120, draw the same gauge scaled down rather than squashed
+        scale = min(1, self.width() / 200, self.height() / 120)
+        painter.scale(scale, scale)
+        width = self.width() / scale
+        height = self.height() / scale
 
         # Set up the gauge area
         gauge_rect = QRectF(15, 15, width - 30, (height - 30) * 2)
@@ -115,54 +80,11 @@ class TemperatureGauge(QWidget):
         self.title = title
         self.temperature = 0
         self.setMinimumSize(100, 120)  # Increased height to accommodate text below
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.updateTemperature)
-        self.timer.start(1000)
-
-    def updateTemperature(self):
-        if self.title == "CPU Temp":
-            self.temperature = self.get_cpu_temperature()
-        elif self.title == "GPU Temp":
-            self.temperature = self.get_gpu_temperature()
-        self.update()
-
-    def get_cpu_temperature(self):
-        try:
-            result = subprocess.run(['sensors'], stdout=subprocess.PIPE, text=True)
-            for line in result.stdout.split('\n'):
-                if 'Tctl' in line:
-                    return float(line.split('+')[1].split('°')[0])
-        except:
-            return 0
-
-    def get_gpu_temperature(self):
-        gpu_type = self.parent().gpu_type
-        if gpu_type == "NVIDIA":
-            try:
-                import pynvml
-                pynvml.nvmlInit()
-                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
-                return temp
-            except:
-                return 0
-        elif gpu_type == "AMD":
-            try:
-                result = subprocess.run(['sensors'], stdout=subprocess.PIPE, text=True)
-                for line in result.stdout.split('\n'):
-                    if 'edge' in line:
-                        return float(line.split('+')[1].split('°')[0])
-            except:
-                return 0
-        elif gpu_type == "Intel":
-            try:
-                result = subprocess.run(['sensors'], stdout=subprocess.PIPE, text=True)
-                for line in result.stdout.split('\n'):
-                    if 'temp1' in line:
-                        return float(line.split('+')[1].split('°')[0])
-            except:
-                return 0
-        return 0
+
+    def set_temperature(self, temperature):
+        if temperature != self.temperature:
+            self.temperature = temperature
+            self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -191,6 +113,41 @@ class TemperatureGauge(QWidget):
         title_rect = QRectF(5, self.height() - 25, self.width() - 10, 20)
         painter.drawText(title_rect, Qt.AlignmentFlag.AlignCenter, self.title)
 
+class GpuPanel(QWidget):
+    # Usage and VRAM gauges plus clock/VRAM text for one GPU
+    def __init__(self, title, reading, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        gauges_layout = QHBoxLayout()
+        self.usage_gauge = Gauge(title, self)
+        gauges_layout.addWidget(self.usage_gauge)
+        self.vram_gauge = None
+        if reading.vram_total:
+            # Two gauges share the panel width, so let them shrink
+            self.vram_gauge = Gauge("VRAM", self)
+            for gauge in (self.usage_gauge, self.vram_gauge):
+                gauge.setMinimumSize(90, 60)
+                gauge.setFixedHeight(60)
+            gauges_layout.addWidget(self.vram_gauge)
+        layout.addLayout(gauges_layout)
+
+        self.info = QLabel(self)
+        self.info.setObjectName("gaugeInfo")
+        self.info.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.info.setWordWrap(True)
+        layout.addWidget(self.info)
+
+    def apply_reading(self, reading):
+        self.usage_gauge.set_value(reading.usage)
+        lines = [reading.name, f"Clock: {reading.clock_mhz} MHz" if reading.clock_mhz else "Clock: N/A"]
+        if reading.vram_total:
+            if self.vram_gauge is not None:
+                self.vram_gauge.set_value(100 * (reading.vram_used or 0) / reading.vram_total)
+            lines.append(f"VRAM: {(reading.vram_used or 0) / (1024**3):.1f} GB / {reading.vram_total / (1024**3):.1f} GB")
+        self.info.setText("\n".join(lines))
+
 class PerformanceMonitor(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -198,6 +155,9 @@ class PerformanceMonitor(QWidget):
         self.config.read('cfg/config.ini')
         self.cpu_type = self.config['Settings'].get('CPUType', 'Intel')
         self.gpu_type = self.config['Settings'].get('GPUType', 'NVIDIA')
+        self.gpu_panels = []
+        self.gpu_temp_gauges = []
+        self.gpu_layout_key = None
         self.initUI()
 
     def initUI(self):
@@ -207,75 +167,70 @@ class PerformanceMonitor(QWidget):
         # Usage gauges and info labels
         self.cpu_gauge = Gauge("CPU", self)
         self.cpu_info = QLabel(self)
-        self.cpu_info.setStyleSheet("color: white; font-size: 12px;")
+        self.cpu_info.setObjectName("gaugeInfo")
         self.cpu_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.ram_gauge = Gauge("RAM", self)
         self.ram_info = QLabel(self)
-        self.ram_info.setStyleSheet("color: white; font-size: 12px;")
+        self.ram_info.setObjectName("gaugeInfo")
         self.ram_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.gpu_gauge = Gauge("GPU", self)
-        self.gpu_info = QLabel(self)
-        self.gpu_info.setStyleSheet("color: white; font-size: 12px;")
-        self.gpu_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # GPU panels are added once the sampler reports which devices exist
+        self.gpu_layout = QVBoxLayout()
+        self.gpu_layout.setSpacing(10)
 
-        # Temperature gauges
-        temp_layout = QHBoxLayout()
+        # Temperature gauges, two per row
+        self.temp_layout = QGridLayout()
         self.cpu_temp_gauge = TemperatureGauge("CPU Temp", self)
-        self.gpu_temp_gauge = TemperatureGauge("GPU Temp", self)
-        temp_layout.addWidget(self.cpu_temp_gauge)
-        temp_layout.addWidget(self.gpu_temp_gauge)
+        self.cpu_temp_gauge.setFixedHeight(120)
+        self.temp_layout.addWidget(self.cpu_temp_gauge, 0, 0)
 
         layout.addWidget(self.cpu_gauge)
         layout.addWidget(self.cpu_info)
         layout.addWidget(self.ram_gauge)
         layout.addWidget(self.ram_info)
-        layout.addWidget(self.gpu_gauge)
-        layout.addWidget(self.gpu_info)
-        layout.addLayout(temp_layout)
-
-        # Set a fixed height for the temperature gauges
-        self.cpu_temp_gauge.setFixedHeight(120)
-        self.gpu_temp_gauge.setFixedHeight(120)
-
-        # Timer to update info labels
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.updateInfo)
-        self.timer.start(1000)
-
-    def updateInfo(self):
-        # Update CPU info
-        cpu_freq = psutil.cpu_freq()
-        self.cpu_info.setText(f"Clock: {cpu_freq.current:.2f} Hz")
-
-        # Update RAM info
-        mem = psutil.virtual_memory()
-        self.ram_info.setText(f"Used: {mem.used / (1024**3):.1f} GB / Total: {mem.total / (1024**3):.1f} GB")
-
-        # Update GPU info
-        self.gpu_info.setText(f"Clock: {self.get_gpu_clock()}")
-
-    def get_gpu_clock(self):
-        if self.gpu_type == "NVIDIA":
-            try:
-                import pynvml
-                pynvml.nvmlInit()
-                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                clock = pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_GRAPHICS)
-                return f"{clock} MHz"
-            except:
-                return "N/A"
-        elif self.gpu_type == "AMD":
-            try:
-                with open('/sys/class/drm/card1/device/pp_dpm_sclk', 'r') as f:
-                    lines = f.readlines()
-                    for line in lines:
-                        if '*' in line:
-                            return line.split(':')[1].strip()
-                return "N/A"
-            except:
-                return "N/A"
-        elif self.gpu_type == "Intel":
-            return "N/A"  # Intel GPU clock speed is not easily accessible
-        return "N/A"
\ No newline at end of file
+        layout.addLayout(self.gpu_layout)
+        layout.addLayout(self.temp_layout)
+
+        # All readings come from the shared background sampler
+        self.sampler = get_telemetry_sampler(self.config)
+        self.sampler.snapshot_ready.connect(self.apply_snapshot)
+        self.sampler.start()
+
+    def build_gpu_gauges(self, gpus):
+        # Rebuilt only when the set of devices changes (first snapshot or a GPUType change)
+        for widget in self.gpu_panels + self.gpu_temp_gauges:
+            widget.setParent(None)
+            widget.deleteLater()
+        self.gpu_panels = []
+        self.gpu_temp_gauges = []
+
+        multiple = len(gpus) > 1
+        for i, reading in enumerate(gpus):
+            title = f"GPU {i}" if multiple else "GPU"
+            panel = GpuPanel(title, reading, self)
+            self.gpu_layout.addWidget(panel)
+            self.gpu_panels.append(panel)
+
+            temp_gauge = TemperatureGauge(f"{title} Temp", self)
+            temp_gauge.setFixedHeight(120)
+            position = i + 1  # The CPU gauge holds the first cell
+            self.temp_layout.addWidget(temp_gauge, position // 2, position % 2)
+            self.gpu_temp_gauges.append(temp_gauge)
+
+    def apply_snapshot(self, snapshot):
+        # Runs on the GUI thread; only copies values from the snapshot, never probes
+        layout_key = tuple((gpu.name, bool(gpu.vram_total)) for gpu in snapshot.gpus)
+        if layout_key != self.gpu_layout_key:
+            self.gpu_layout_key = layout_key
+            self.build_gpu_gauges(snapshot.gpus)
+
+        self.cpu_gauge.set_value(snapshot.cpu_percent)
+        self.ram_gauge.set_value(snapshot.ram_percent)
+        self.cpu_temp_gauge.set_temperature(snapshot.cpu_temp)
+        for panel, temp_gauge, reading in zip(self.gpu_panels, self.gpu_temp_gauges, snapshot.gpus):
+            panel.apply_reading(reading)
+            temp_gauge.set_temperature(reading.temperature or 0)
+
+        self.cpu_info.setText(f"Clock: {snapshot.cpu_clock_mhz:.0f} MHz")
+        self.ram_info.setText(f"Used: {snapshot.ram_used / (1024**3):.1f} GB / Total: {snapshot.ram_total / (1024**3):.1f} GB")
@@ -1,6 +1,10 @@
 import subprocess
 from PyQt6.QtWidgets import QLabel, QMessageBox
 from PyQt6.QtCore import Qt, pyqtSignal
+from lib.theme import set_style_state
+
+# Status checks run on the shared worker pool; a hung podman must not hold a thread forever
+STATUS_TIMEOUT = 5  # seconds
 
 class ClickableStatusIndicator(QLabel):
     clicked = pyqtSignal(str)  # Signal to emit the container name when clicked
@@ -9,13 +13,7 @@ class ClickableStatusIndicator(QLabel):
         super().__init__(name)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setFixedSize(100, 30)
-        self.setStyleSheet("""
-            QLabel {
-                border: 2px solid #ff4d4d;
-                border-radius: 10px;
-                padding: 2px;
-            }
-        """)
+        self.setObjectName("statusIndicator")
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -26,43 +24,54 @@ def create_status_indicator(name):
     return ClickableStatusIndicator(name)
 
 def update_podman_status(status_widget):
-    try:
-        subprocess.run(["podman", "info"], check=True, capture_output=True)
-        set_status_color(status_widget, "green")
-    except subprocess.CalledProcessError:
-        set_status_color(status_widget, "red")
+    set_status_color(status_widget, get_podman_status_color())
 
 def update_container_status(container_name, container_id, status_widget):
+    set_status_color(status_widget, get_container_status_color(container_name, container_id))
+
+def get_podman_status_color():
+    try:
+        subprocess.run(["podman", "info"], check=True, capture_output=True, timeout=STATUS_TIMEOUT)
+        return "green"
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        return "red"
+
+def get_container_status_color(container_name, container_id):
     try:
         print(f"Checking status for container: {container_name}")  # Debug print
         result = subprocess.run(["podman", "inspect", "-f", "{{.State.Status}}", container_id], 
-                                check=True, capture_output=True, text=True)
+                                check=True, capture_output=True, text=True, timeout=STATUS_TIMEOUT)
         status = result.stdout.strip()
         print(f"Status for {container_name}: {status}")  # Debug print
         if status == "running":
-            set_status_color(status_widget, "green")
+            return "green"
         elif status == "exited":
-            set_status_color(status_widget, "red")
+            return "red"
         else:
-            set_status_color(status_widget, "yellow")
+            return "yellow"
     except subprocess.CalledProcessError as e:
         print(f"Error checking status for {container_name}: {e}")  # Debug print
         # Check if the exit status is 125
         if e.returncode == 125:
-            set_status_color(status_widget, "red")
+            return "red"
         else:
-            set_status_color(status_widget, "yellow")
+            return "yellow"
+    except subprocess.TimeoutExpired:
+        print(f"Timed out checking status for {container_name}")  # Debug print
+        return "yellow"
+    except FileNotFoundError:
+        return "red"
+
+def collect_status_colors(containers):
+    # Runs every podman check for the status bar; safe to call off the GUI thread
+    colors = {'Podman': get_podman_status_color()}
+    for container_name, container_id in containers:
+        colors[container_name] = get_container_status_color(container_name, container_id)
+    return colors
 
 def set_status_color(widget, color):
-    widget.setStyleSheet(f"""
-        QLabel {{
-            background-color: {color};
-            color: black;
-            border: 2px solid #ff4d4d;
-            border-radius: 10px;
-            padding: 2px;
-        }}
-    """)
+    # Polled every few seconds; only re-polishes when the status actually changes
+    set_style_state(widget, "status", color)
 
 def container_action(container_id, action):
     try:
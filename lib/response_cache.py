@@ -0,0 +1,75 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+RESPONSE_CACHE_FILE = os.path.join('cache', 'responses.db')
+DEFAULT_MAX_MB = 64
+
+class ResponseCache:
+    def __init__(self, db_file=RESPONSE_CACHE_FILE, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS responses
+                             (key TEXT PRIMARY KEY, provider TEXT NOT NULL, model TEXT NOT NULL,
+                              response TEXT NOT NULL, size INTEGER NOT NULL,
+                              created REAL NOT NULL, last_used REAL NOT NULL)''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(provider, model, messages, params=None):
+        # Whitespace and role case don't change the answer, so they don't change the key
+        normalized = [{"role": m["role"].strip().lower(), "content": " ".join(m["content"].split())}
+                      for m in messages]
+        payload = json.dumps([provider, model, normalized, params or {}], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, key, provider, model, response):
+        now = time.time()
+        with self.conn:
+            self.conn.execute('''INSERT OR REPLACE INTO responses
+                                 (key, provider, model, response, size, created, last_used)
+                                 VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                              (key, provider, model, response, len(response.encode('utf-8')), now, now))
+        self.evict()
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits its size budget
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        with self.conn:
+            for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM responses")
+        self.conn.execute("VACUUM")
+
+_response_cache = None
+
+def get_response_cache(config):
+    # Opt-in: [Settings] ResponseCache = True, ResponseCacheMB = 64
+    global _response_cache
+    if not config['Settings'].getboolean('ResponseCache', fallback=False):
+        return None
+    if _response_cache is None:
+        max_mb = config['Settings'].getint('ResponseCacheMB', fallback=DEFAULT_MAX_MB)
+        _response_cache = ResponseCache(max_bytes=max_mb * 1024 * 1024)
+    return _response_cache
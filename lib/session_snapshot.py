@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import pickle
+import threading
+from PyQt6.QtCore import QObject, QTimer
+from lib.workers import ProviderRequest, start_request
+
+SNAPSHOT_FILE = os.path.join('cfg', 'session.json')
+LEGACY_TABS_FILE = os.path.join('cfg', 'saved_tabs.pkl')
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DEBOUNCE_MS = 1000
+
+def write_session_snapshot(tabs, path=SNAPSHOT_FILE):
+    # Write to a temp file, fsync and rename over the old snapshot, so a crash
+    # mid-write leaves either the old or the new snapshot, never a torn one
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "saved": time.time(),
+        "tabs": {key: [[name, url] for name, url in entries] for key, entries in tabs.items()},
+    }
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(snapshot, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+_write_lock = threading.Lock()
+_written_seq = 0
+
+def write_snapshot_in_order(tabs, seq):
+    # Background writes and the final flush can overlap; never let an older state win
+    global _written_seq
+    with _write_lock:
+        if seq <= _written_seq:
+            return
+        write_session_snapshot(tabs)
+        _written_seq = seq
+
+def migrate_legacy_tabs():
+    # One-time import of the pickle written by older versions on clean exit
+    try:
+        with open(LEGACY_TABS_FILE, 'rb') as f:
+            tabs = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Unable to read legacy saved tabs: {e}")
+        return {}
+    write_session_snapshot(tabs)
+    os.replace(LEGACY_TABS_FILE, LEGACY_TABS_FILE + '.migrated')
+    print("Migrated saved tabs to session snapshot")
+    return tabs
+
+def read_session_snapshot(path=SNAPSHOT_FILE):
+    # Returns {'llm': [(name, url), ...], ...}; never raises on a missing or bad file
+    try:
+        with open(path, 'r') as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return migrate_legacy_tabs()
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable session snapshot: {e}")
+        return {}
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        print(f"Ignoring session snapshot with unknown version {snapshot.get('version')}")
+        return {}
+    return {key: [tuple(entry) for entry in entries] for key, entries in snapshot.get("tabs", {}).items()}
+
+class SessionSnapshotter(QObject):
+    # Debounces tab changes and writes the snapshot on the worker pool.
+    # collect_state runs on the GUI thread, since it reads the tab widgets.
+    def __init__(self, collect_state, debounce_ms=SNAPSHOT_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.collect_state = collect_state
+        self.pending_request = None
+        self.dirty = False
+        self.last_written = None
+        self.seq = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.save)
+
+    def schedule(self, *args):
+        self.timer.start()
+
+    def save(self):
+        if self.pending_request is not None:
+            self.dirty = True  # Write again once the current write lands
+            return
+        state = self.collect_state()
+        if state == self.last_written:
+            return
+        self.dirty = False
+        self.seq += 1
+        self.pending_request = ProviderRequest(write_snapshot_in_order, state, self.seq)
+        self.pending_request.signals.finished.connect(lambda request_id, result: self.on_saved(state))
+        self.pending_request.signals.failed.connect(lambda request_id, error: self.on_save_failed(error))
+        start_request(self.pending_request)
+
+    def on_saved(self, state):
+        self.pending_request = None
+        self.last_written = state
+        if self.dirty:
+            self.save()
+
+    def on_save_failed(self, error):
+        self.pending_request = None
+        print(f"Failed to save session snapshot: {error}")
+        if self.dirty:
+            self.save()
+
+    def flush(self):
+        # Synchronous final write, used on exit
+        self.timer.stop()
+        state = self.collect_state()
+        if state != self.last_written or self.pending_request is not None:
+            self.seq += 1
+            write_snapshot_in_order(state, self.seq)
+            self.last_written = state
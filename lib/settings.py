@@ -6,6 +6,9 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLineEdit, QTabl
                              QRadioButton, QButtonGroup)
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QColor
+from lib.ollama_client import get_ollama_client
+from lib.model_catalog import get_model_catalog
+from lib.enhanced_browser import get_shared_profile
 import requests
 
 class ColorSwatch(QPushButton):
@@ -30,6 +33,7 @@ class SettingsPage(QWidget):
     def __init__(self, config):
         super().__init__()
         self.config = config
+        self.setObjectName("settingsPage")
         self.init_ui()
 
     def init_ui(self):
@@ -40,31 +44,6 @@ class SettingsPage(QWidget):
         containers_toggle_layout = QVBoxLayout(containers_toggle_group)
         self.containers_checkbox = QCheckBox("Enable Containers Footer")
         self.containers_checkbox.setChecked(self.config['Settings'].getboolean('EnableContainers', fallback=True))
-        self.containers_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: white;
-            }
-            QCheckBox::indicator {
-                width: 13px;
-                height: 13px;
-                border: 1px solid white;
-            }
-            QCheckBox::indicator:unchecked {
-                background-color: transparent;
-            }
-            QCheckBox::indicator:checked {
-                background-color: green;
-            }
-            QCheckBox::indicator:checked::after {
-                content: '✓';
-                color: black;
-                position: absolute;
-                top: -3px;
-                left: 1px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
 
         # Top section (Color Theme, Hardware Configuration, and AI Services)
         top_widget = QWidget()
@@ -96,31 +75,12 @@ class SettingsPage(QWidget):
 
         # CPU Type
         cpu_label = QLabel("CPU Type:")
-        cpu_label.setStyleSheet("color: white;")
         cpu_gpu_layout.addWidget(cpu_label, 0, 0)
 
         self.cpu_group = QButtonGroup(self)
         cpu_types = ["Intel", "AMD", "ARM"]
         for i, cpu_type in enumerate(cpu_types):
             radio = QRadioButton(cpu_type)
-            radio.setStyleSheet("""
-                QRadioButton {
-                    color: white;
-                }
-                QRadioButton::indicator {
-                    width: 13px;
-                    height: 13px;
-                    border: 1px solid white;
-                    border-radius: 7px;
-                }
-                QRadioButton::indicator:unchecked {
-                    background-color: transparent;
-                }
-                QRadioButton::indicator:checked {
-                    background-color: white;
-                    border: 2px solid white;
-                }
-            """)
             self.cpu_group.addButton(radio)
             cpu_gpu_layout.addWidget(radio, 0, i+1)
             if self.config['Settings'].get('CPUType', 'Intel') == cpu_type:
@@ -128,31 +88,12 @@ class SettingsPage(QWidget):
 
         # GPU Type
         gpu_label = QLabel("GPU Type:")
-        gpu_label.setStyleSheet("color: white;")
         cpu_gpu_layout.addWidget(gpu_label, 1, 0)
 
         self.gpu_group = QButtonGroup(self)
         gpu_types = ["Intel", "NVIDIA", "AMD"]
         for i, gpu_type in enumerate(gpu_types):
             radio = QRadioButton(gpu_type)
-            radio.setStyleSheet("""
-                QRadioButton {
-                    color: white;
-                }
-                QRadioButton::indicator {
-                    width: 13px;
-                    height: 13px;
-                    border: 1px solid white;
-                    border-radius: 7px;
-                }
-                QRadioButton::indicator:unchecked {
-                    background-color: transparent;
-                }
-                QRadioButton::indicator:checked {
-                    background-color: white;
-                    border: 2px solid white;
-                }
-            """)
             self.gpu_group.addButton(radio)
             cpu_gpu_layout.addWidget(radio, 1, i+1)
             if self.config['Settings'].get('GPUType', 'NVIDIA') == gpu_type:
@@ -170,34 +111,9 @@ class SettingsPage(QWidget):
         for service in ["ChatGPT", "Claude", "Gemini"]:
             service_layout = QHBoxLayout()
             checkbox = QCheckBox(service)
-            checkbox.setStyleSheet("""
-                QCheckBox {
-                    color: white;
-                }
-                QCheckBox::indicator {
-                    width: 13px;
-                    height: 13px;
-                    border: 1px solid white;
-                }
-                QCheckBox::indicator:unchecked {
-                    background-color: transparent;
-                }
-                QCheckBox::indicator:checked {
-                    background-color: green;
-                }
-                QCheckBox::indicator:checked::after {
-                    content: '✓';
-                    color: black;
-                    position: absolute;
-                    top: -3px;
-                    left: 1px;
-                    font-size: 14px;
-                    font-weight: bold;
-                }
-            """)
             api_key_input = QLineEdit()
             api_key_input.setPlaceholderText(f"{service} API Key")
-            api_key_input.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+            api_key_input.setProperty("surface", "glass")
             
             self.service_checkboxes[service] = checkbox
             self.api_key_inputs[service] = api_key_input
@@ -221,7 +137,7 @@ class SettingsPage(QWidget):
         # Add Fetch Running Containers button
         fetch_button = QPushButton("Fetch Running Containers")
         fetch_button.clicked.connect(self.fetch_running_containers)
-        fetch_button.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        fetch_button.setProperty("surface", "glass")
         containers_layout.addWidget(fetch_button)
         
         # Containers Section
@@ -248,12 +164,12 @@ class SettingsPage(QWidget):
 
         clear_cache_button = QPushButton("Clear Browser Cache")
         clear_cache_button.clicked.connect(self.clear_cache)
-        clear_cache_button.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        clear_cache_button.setProperty("surface", "glass")
         bottom_layout.addWidget(clear_cache_button)
 
         save_reload_button = QPushButton("Save and Reload UI")
         save_reload_button.clicked.connect(self.save_and_reload_ui)
-        save_reload_button.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        save_reload_button.setProperty("surface", "glass")
         bottom_layout.addWidget(save_reload_button)
 
         self.main_layout.addWidget(bottom_widget, 4, 0, 1, 2)
@@ -262,38 +178,12 @@ class SettingsPage(QWidget):
 
     def create_section(self, section_name):
         group = QGroupBox(section_name)
-        group.setStyleSheet("QGroupBox { color: white; }")
         layout = QVBoxLayout(group)
 
         if section_name == "Containers":
             # Add Containers toggle checkbox
             self.containers_checkbox = QCheckBox("Enable Containers Footer")
             self.containers_checkbox.setChecked(self.config['Settings'].getboolean('EnableContainers', fallback=True))
-            self.containers_checkbox.setStyleSheet("""
-                QCheckBox {
-                    color: white;
-                }
-                QCheckBox::indicator {
-                    width: 13px;
-                    height: 13px;
-                    border: 1px solid white;
-                }
-                QCheckBox::indicator:unchecked {
-                    background-color: transparent;
-                }
-                QCheckBox::indicator:checked {
-                    background-color: green;
-                }
-                QCheckBox::indicator:checked::after {
-                    content: '✓';
-                    color: black;
-                    position: absolute;
-                    top: -3px;
-                    left: 1px;
-                    font-size: 14px;
-                    font-weight: bold;
-                }
-            """)
             layout.addWidget(self.containers_checkbox)
 
         self.setup_input_section(layout, section_name)
@@ -306,12 +196,12 @@ class SettingsPage(QWidget):
         input_layout = QHBoxLayout()
         name_entry = QLineEdit()
         name_entry.setPlaceholderText(f"{section_name} Name")
-        name_entry.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        name_entry.setProperty("surface", "glass")
         value_entry = QLineEdit()
         value_entry.setPlaceholderText(f"{section_name} Value")
-        value_entry.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        value_entry.setProperty("surface", "glass")
         add_button = QPushButton(f"Add {section_name}")
-        add_button.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        add_button.setProperty("surface", "glass")
         input_layout.addWidget(name_entry)
         input_layout.addWidget(value_entry)
         input_layout.addWidget(add_button)
@@ -327,22 +217,6 @@ class SettingsPage(QWidget):
         table.horizontalHeader().setStretchLastSection(True)
         table.verticalHeader().setVisible(False)
         table.setFixedHeight(200)
-        table.setStyleSheet("""
-            QTableWidget {
-                background-color: #2d2d2d;
-                color: #ffffff;
-                gridline-color: #3a3a3a;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-            QHeaderView::section {
-                background-color: #3a3a3a;
-                color: #ffffff;
-                padding: 5px;
-                border: 1px solid #2d2d2d;
-            }
-        """)
         return table
 
     def setup_ollama_section(self):
@@ -352,61 +226,30 @@ class SettingsPage(QWidget):
         # Enable/Disable checkbox
         self.ollama_checkbox = QCheckBox("Enable Ollama")
         self.ollama_checkbox.setChecked(self.config['Settings'].getboolean('Ollama', fallback=False))
-        self.ollama_checkbox.setStyleSheet("""
-            QCheckBox {
-                color: white;
-            }
-            QCheckBox::indicator {
-                width: 13px;
-                height: 13px;
-                border: 1px solid white;
-            }
-            QCheckBox::indicator:unchecked {
-                background-color: transparent;
-            }
-            QCheckBox::indicator:checked {
-                background-color: green;
-            }
-            QCheckBox::indicator:checked::after {
-                content: '✓';
-                color: black;
-                position: absolute;
-                top: -3px;
-                left: 1px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
         ollama_layout.addWidget(self.ollama_checkbox)
         
         # Server address input
         server_layout = QHBoxLayout()
         server_layout.addWidget(QLabel("Server:"))
         self.ollama_server_input = QLineEdit(self.config['Settings'].get('OllamaServer', 'http://127.0.0.1:11434'))
-        self.ollama_server_input.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        self.ollama_server_input.setProperty("surface", "glass")
         server_layout.addWidget(self.ollama_server_input)
         ollama_layout.addLayout(server_layout)
 
         # Model list
         self.ollama_model_list = QListWidget()
-        self.ollama_model_list.setStyleSheet("""
-            QListWidget {
-                background-color: rgba(255, 255, 255, 10);
-                color: white;
-            }
-            QListWidget::item {
-                padding: 5px;
-            }
-        """)
+        self.ollama_model_list.setProperty("surface", "tint")
         self.ollama_model_list.itemDoubleClicked.connect(self.delete_ollama_model)
         ollama_layout.addWidget(self.ollama_model_list)
 
         refresh_button = QPushButton("Refresh Models")
-        refresh_button.clicked.connect(self.refresh_ollama_models)
-        refresh_button.setStyleSheet("color: white; background-color: rgba(255, 255, 255, 30);")
+        refresh_button.clicked.connect(lambda: self.refresh_ollama_models())
+        refresh_button.setProperty("surface", "glass")
         ollama_layout.addWidget(refresh_button)
 
-        self.refresh_ollama_models()
+        self.ollama_catalog = None
+        self.ollama_refresh_requested = False
+        self.bind_ollama_catalog()
 
         return ollama_group
                                                                               
@@ -418,9 +261,8 @@ class SettingsPage(QWidget):
                                     QMessageBox.StandardButton.No)
 
         if reply == QMessageBox.StandardButton.Yes:
-            server_address = self.ollama_server_input.text()
             try:
-                response = requests.delete(f"{server_address}/api/delete", json={"name": model_name})
+                response = get_ollama_client(self.config, self.ollama_server_input.text()).delete_model(model_name)
                 if response.status_code == 200:
                     self.show_themed_message_box("Success", f"Model '{model_name}' has been deleted.", QMessageBox.Icon.Information)
                     self.refresh_ollama_models()
@@ -429,17 +271,37 @@ class SettingsPage(QWidget):
             except requests.RequestException as e:
                 self.show_themed_message_box("Error", f"Failed to delete model '{model_name}': {str(e)}", QMessageBox.Icon.Warning)
 
+    def bind_ollama_catalog(self):
+        # Render from the catalog of whichever server is in the input box and follow its updates
+        catalog = get_model_catalog(self.config, self.ollama_server_input.text())
+        if catalog is not self.ollama_catalog:
+            if self.ollama_catalog is not None:
+                self.ollama_catalog.models_changed.disconnect(self.populate_ollama_models)
+                self.ollama_catalog.refresh_failed.disconnect(self.on_ollama_refresh_failed)
+                self.ollama_catalog.refresh_finished.disconnect(self.on_ollama_refresh_finished)
+            catalog.models_changed.connect(self.populate_ollama_models)
+            catalog.refresh_failed.connect(self.on_ollama_refresh_failed)
+            catalog.refresh_finished.connect(self.on_ollama_refresh_finished)
+            self.ollama_catalog = catalog
+            self.populate_ollama_models(catalog.models)
+        return catalog
+
     def refresh_ollama_models(self):
+        self.ollama_refresh_requested = True
+        self.bind_ollama_catalog().refresh(force=True)
+
+    def populate_ollama_models(self, models):
         self.ollama_model_list.clear()
-        server_address = self.ollama_server_input.text()
-        try:
-            response = requests.get(f"{server_address}/api/tags")
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                for model in models:
-                    item = QListWidgetItem(model["name"])
-                    self.ollama_model_list.addItem(item)
-        except requests.RequestException:
+        for model_name in models:
+            self.ollama_model_list.addItem(QListWidgetItem(model_name))
+
+    def on_ollama_refresh_finished(self):
+        self.ollama_refresh_requested = False
+
+    def on_ollama_refresh_failed(self, error):
+        # Background refreshes fail quietly; only a refresh the user asked for reports it
+        if self.ollama_refresh_requested:
+            self.ollama_refresh_requested = False
             self.show_themed_message_box("Error", "Failed to fetch Ollama models", QMessageBox.Icon.Warning)
 
     def fetch_running_containers(self):
@@ -512,11 +374,8 @@ class SettingsPage(QWidget):
         self.config['Settings']['ColorTheme'] = theme
 
     def clear_cache(self):
-        if hasattr(self.parent(), 'persistent_profile'):
-            self.parent().persistent_profile.clearHttpCache()
-            self.show_themed_message_box("Cache Cleared", "The browser cache has been cleared.", QMessageBox.Icon.Information)
-        else:
-            self.show_themed_message_box("Error", "Unable to clear cache. Persistent profile not found.", QMessageBox.Icon.Warning)
+        get_shared_profile(self.config).clearHttpCache()
+        self.show_themed_message_box("Cache Cleared", "The browser cache has been cleared.", QMessageBox.Icon.Information)
 
     def save_and_reload_ui(self):
         selected_theme = next(name for name, swatch in self.color_swatches.items() if swatch.isChecked())
@@ -544,20 +403,4 @@ class SettingsPage(QWidget):
         msg_box.setWindowTitle(title)
         msg_box.setText(message)
         msg_box.setIcon(icon)
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: #2d2d2d;
-                color: #ffffff;
-            }
-            QPushButton {
-                background-color: #3a3a3a;
-                color: #ffffff;
-                border: 1px solid #4a4a4a;
-                padding: 5px 15px;
-                border-radius: 3px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-            }
-        """)
         msg_box.exec()
\ No newline at end of file
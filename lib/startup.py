@@ -0,0 +1,68 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from lib.workers import ProviderRequest, start_request
+from lib.menu import collect_system_info
+from lib.podman import collect_status_colors
+from lib.model_catalog import get_model_catalog
+from lib.startup_trace import tracer
+from lib.session_snapshot import read_session_snapshot
+
+STARTUP_TIMEOUT_MS = 8000
+
+class StartupLoader(QObject):
+    # Runs the slow parts of startup concurrently on the worker pool while the
+    # splash is up, and hands the results to MainWindow once they are all in
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+        self.results = {}
+        self.requests = {}
+        self.done = False
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.setSingleShot(True)
+        self.timeout_timer.timeout.connect(self.finish)
+
+    def start(self):
+        tasks = {
+            'system_info': ("Detecting hardware", collect_system_info),
+            'saved_tabs': ("Restoring tabs", read_session_snapshot),
+        }
+        if self.config['Settings'].getboolean('EnableContainers', fallback=True):
+            containers = list(self.config['Containers'].items())
+            tasks['status_colors'] = ("Checking containers", lambda: collect_status_colors(containers))
+
+        # The model catalog refreshes itself in the background; just get it started early
+        if self.config['Settings'].get('OllamaServer', ''):
+            get_model_catalog(self.config)
+
+        for name, (label, fn) in tasks.items():
+            request = ProviderRequest(fn)
+            request.signals.finished.connect(lambda request_id, result, name=name: self.on_task_done(name, result))
+            request.signals.failed.connect(lambda request_id, error, name=name: self.on_task_done(name, None))
+            self.requests[name] = request
+            self.progress.emit(f"{label}...")
+            tracer.begin(f"startup task: {name}")
+            start_request(request)
+
+        # Never let a hung probe (e.g. an unresponsive podman) hold the window back
+        self.timeout_timer.start(STARTUP_TIMEOUT_MS)
+
+    def on_task_done(self, name, result):
+        if self.done:
+            return
+        tracer.end(f"startup task: {name}")
+        if result is not None:
+            self.results[name] = result
+        self.requests.pop(name, None)
+        self.progress.emit(f"Loaded {name.replace('_', ' ')}")
+        if not self.requests:
+            self.finish()
+
+    def finish(self):
+        if self.done:
+            return
+        self.done = True
+        self.timeout_timer.stop()
+        self.finished.emit(self.results)
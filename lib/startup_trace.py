@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+TRACE_FLAG = '--trace-startup'
+DEFAULT_TRACE_FILE = 'startup_trace.json'
+
+class StartupTracer:
+    # Records named spans during launch and writes them as a Chrome trace
+    # (open in chrome://tracing or https://ui.perfetto.dev) plus a summary table.
+    # Disabled unless the app is started with --trace-startup[=path].
+    def __init__(self, enabled=False, trace_file=DEFAULT_TRACE_FILE):
+        self.enabled = enabled
+        self.trace_file = trace_file
+        self.origin = time.perf_counter()
+        self.spans = []  # (name, start, end, thread id, async)
+        self.open_spans = {}
+        self.instants = []
+        self.lock = threading.Lock()
+
+    def now(self):
+        return time.perf_counter() - self.origin
+
+    def add_span(self, name, start, end, is_async=False):
+        with self.lock:
+            self.spans.append((name, start, end, threading.get_ident(), is_async))
+
+    @contextmanager
+    def span(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, self.now())
+
+    def begin(self, name):
+        # For spans that start and end in different callbacks
+        if self.enabled and name not in self.open_spans:
+            self.open_spans[name] = self.now()
+
+    def end(self, name):
+        if self.enabled and name in self.open_spans:
+            self.add_span(name, self.open_spans.pop(name), self.now(), is_async=True)
+
+    def instant(self, name):
+        if self.enabled:
+            self.instants.append((name, self.now()))
+
+    def watch_first_paint(self, window, callback=None):
+        # Ends the "first paint" span when any widget of `window` paints for the first time
+        if not self.enabled:
+            return
+        from PyQt6.QtCore import QObject, QEvent
+        from PyQt6.QtWidgets import QApplication
+
+        tracer = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint and getattr(obj, 'window', None) and obj.window() is window:
+                    QApplication.instance().removeEventFilter(self)
+                    tracer.end("first paint")
+                    if callback:
+                        callback()
+                return False
+
+        self.begin("first paint")
+        self.paint_filter = FirstPaintFilter()
+        QApplication.instance().installEventFilter(self.paint_filter)
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        events = []
+        for i, (name, start, end, tid, is_async) in enumerate(sorted(self.spans, key=lambda s: s[1])):
+            if is_async:
+                events.append({"name": name, "cat": "startup", "ph": "b", "id": i, "ts": start * 1e6, "pid": pid, "tid": tid})
+                events.append({"name": name, "cat": "startup", "ph": "e", "id": i, "ts": end * 1e6, "pid": pid, "tid": tid})
+            else:
+                events.append({"name": name, "cat": "startup", "ph": "X", "ts": start * 1e6,
+                               "dur": (end - start) * 1e6, "pid": pid, "tid": tid})
+        for name, ts in self.instants:
+            events.append({"name": name, "cat": "startup", "ph": "i", "s": "g", "ts": ts * 1e6, "pid": pid, "tid": 0})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self):
+        lines = [f"{'Span':<40} {'Start ms':>10} {'Duration ms':>12}"]
+        for name, start, end, tid, is_async in sorted(self.spans, key=lambda s: s[1]):
+            lines.append(f"{name:<40} {start * 1000:>10.1f} {(end - start) * 1000:>12.1f}")
+        for name, ts in self.instants:
+            lines.append(f"{name:<40} {ts * 1000:>10.1f} {'-':>12}")
+        return "\n".join(lines)
+
+    def finish(self):
+        # Safe to call more than once; later calls rewrite the file with any new spans
+        if not self.enabled:
+            return
+        with open(self.trace_file, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+        print(self.summary())
+        print(f"Startup trace written to {self.trace_file}")
+
+def parse_trace_flag(argv):
+    # Strips --trace-startup[=path] from argv so Qt never sees it
+    for arg in list(argv):
+        if arg == TRACE_FLAG or arg.startswith(TRACE_FLAG + '='):
+            argv.remove(arg)
+            return True, arg.partition('=')[2] or DEFAULT_TRACE_FILE
+    return False, DEFAULT_TRACE_FILE
+
+tracer = StartupTracer(*parse_trace_flag(sys.argv))
@@ -0,0 +1,122 @@
+import time
+import threading
+from typing import NamedTuple
+import psutil
+from PyQt6.QtCore import QObject, pyqtSignal
+from lib.gpu_backends import create_gpu_backend
+from lib.hwmon import CPU_TEMPERATURE_SENSORS, open_temperature_sensor
+
+DEFAULT_INTERVAL_MS = 1000
+PROBE_TIMEOUT = 2  # seconds
+
+class TelemetrySnapshot(NamedTuple):
+    # One immutable reading of everything the gauges show
+    timestamp: float
+    cpu_percent: float
+    cpu_clock_mhz: float
+    ram_percent: float
+    ram_used: int
+    ram_total: int
+    cpu_temp: float
+    gpus: tuple  # One GPUReading per device
+
+class TelemetrySampler(QObject):
+    # Samples every gauge's data in one pass on a background thread and publishes
+    # a TelemetrySnapshot; widgets only paint from the latest snapshot
+    snapshot_ready = pyqtSignal(object)
+
+    def __init__(self, gpu_type="NVIDIA", interval_ms=DEFAULT_INTERVAL_MS):
+        super().__init__()
+        self.gpu_type = gpu_type
+        self.interval_ms = interval_ms
+        self.gpu_backend = None
+        self.cpu_temp_sensor = None
+        self.cpu_temp_searched = False
+        self.latest = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def configure(self, config):
+        self.gpu_type = config['Settings'].get('GPUType', 'NVIDIA')
+        self.interval_ms = max(100, config['Settings'].getint('TelemetryIntervalMs', fallback=DEFAULT_INTERVAL_MS))
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=PROBE_TIMEOUT * 2)
+        if self.thread is not None and self.thread.is_alive():
+            return  # Still inside a probe; leave its files open rather than racing it
+        if self.gpu_backend is not None:
+            self.gpu_backend.close()
+            self.gpu_backend = None
+        if self.cpu_temp_sensor is not None:
+            self.cpu_temp_sensor.close()
+            self.cpu_temp_sensor = None
+            self.cpu_temp_searched = False
+
+    def get_gpu_backend(self):
+        # Created on the sampler thread so a slow vendor library init never blocks the UI,
+        # and recreated only when the configured GPU type changes
+        gpu_type = self.gpu_type
+        if self.gpu_backend is None or self.gpu_backend_type != gpu_type:
+            if self.gpu_backend is not None:
+                self.gpu_backend.close()
+            self.gpu_backend = create_gpu_backend(gpu_type, interval_ms=self.interval_ms)
+            self.gpu_backend_type = gpu_type
+        return self.gpu_backend
+
+    def get_cpu_temperature(self):
+        # The hwmon file is found once and then read in place
+        if not self.cpu_temp_searched:
+            self.cpu_temp_searched = True
+            self.cpu_temp_sensor = open_temperature_sensor(CPU_TEMPERATURE_SENSORS)
+        if self.cpu_temp_sensor is None:
+            return 0
+        try:
+            return self.cpu_temp_sensor.read_celsius()
+        except (OSError, ValueError):
+            return 0
+
+    def sample(self):
+        gpus = self.get_gpu_backend().sample()
+        cpu_freq = psutil.cpu_freq()
+        mem = psutil.virtual_memory()
+        return TelemetrySnapshot(
+            timestamp=time.time(),
+            cpu_percent=psutil.cpu_percent(),
+            cpu_clock_mhz=cpu_freq.current if cpu_freq else 0,
+            ram_percent=mem.percent,
+            ram_used=mem.used,
+            ram_total=mem.total,
+            cpu_temp=self.get_cpu_temperature(),
+            gpus=tuple(gpus),
+        )
+
+    def run(self):
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                self.latest = self.sample()
+                self.snapshot_ready.emit(self.latest)
+            except Exception as e:
+                print(f"Telemetry sample failed: {e}")
+            # Keep a steady rate regardless of how long the probes took
+            elapsed = time.monotonic() - started
+            self.stop_event.wait(max(0, self.interval_ms / 1000 - elapsed))
+
+_telemetry_sampler = None
+
+def get_telemetry_sampler(config=None):
+    global _telemetry_sampler
+    if _telemetry_sampler is None:
+        _telemetry_sampler = TelemetrySampler()
+    if config is not None:
+        _telemetry_sampler.configure(config)
+    return _telemetry_sampler
@@ -1,29 +1,24 @@
-from PyQt6.QtGui import QColor, QLinearGradient, QBrush, QPalette
+from PyQt6.QtGui import QColor, QLinearGradient, QBrush, QPalette, QGradient
 
-def get_color_theme(theme):
-    color_map = {
-        "Dark Red": ("#8B0000", "#4B0000"),
-        "Dark Blue": ("#00008B", "#00004B"),
-        "Dark Green": ("#006400", "#003400"),
-        "Dark Purple": ("#4B0082", "#250041"),
-        "Blackout": ("#000000", "#000000")
-    }
-    return color_map.get(theme, ("#8B0000", "#4B0000"))  # Default to Dark Red
+COLOR_THEMES = {
+    "Dark Red": ("#8B0000", "#4B0000"),
+    "Dark Blue": ("#00008B", "#00004B"),
+    "Dark Green": ("#006400", "#003400"),
+    "Dark Purple": ("#4B0082", "#250041"),
+    "Blackout": ("#000000", "#000000")
+}
 
-def set_color_theme(window, theme):
-    base_color, gradient_start = get_color_theme(theme)
+_stylesheets = {}
 
-    # Set gradient background
-    gradient = QLinearGradient(0, 0, 0, window.height())
-    gradient.setColorAt(0, QColor(gradient_start))
-    gradient.setColorAt(1, QColor(0, 0, 0))  # Black at bottom
-    
-    palette = window.palette()
-    palette.setBrush(QPalette.ColorRole.Window, QBrush(gradient))
-    window.setPalette(palette)
-    
-    # Update StyleSheet
-    window.setStyleSheet(f"""
+def get_color_theme(theme):
+    return COLOR_THEMES.get(theme, ("#8B0000", "#4B0000"))  # Default to Dark Red
+
+def get_theme_stylesheet(theme):
+    # Each theme's stylesheet is built once and reused
+    stylesheet = _stylesheets.get(theme)
+    if stylesheet is None:
+        base_color, _ = get_color_theme(theme)
+        stylesheet = f"""
         QMainWindow, QTabWidget, QStatusBar, QWidget, QMessageBox {{
             color: #ffffff;
         }}
@@ -74,4 +69,154 @@ def set_color_theme(window, theme):
         QMessageBox QPushButton:hover {{
             background-color: #4a4a4a;
         }}
-    """)
\ No newline at end of file
+
+        /* Widgets opt into these looks with dynamic properties (see set_style_state) */
+        QLineEdit[surface="glass"], QPushButton[surface="glass"] {{
+            color: white;
+            background-color: rgba(255, 255, 255, 30);
+        }}
+        QListView[surface="clear"] {{
+            color: white;
+            background-color: transparent;
+        }}
+        QListView[surface="tint"] {{
+            color: white;
+            background-color: rgba(255, 255, 255, 10);
+        }}
+        QListWidget[surface="tint"]::item {{
+            padding: 5px;
+        }}
+        QPushButton[nav="true"] {{
+            color: white;
+            background-color: rgba(255, 255, 255, 30);
+            border: 1px solid {base_color};
+            border-radius: 15px;
+            padding: 5px;
+        }}
+        QPushButton[nav="true"]:hover {{
+            background-color: rgba(255, 255, 255, 45);
+        }}
+        QPushButton[nav="true"][selected="true"] {{
+            border: 3px solid white;
+        }}
+        QPushButton[nav="true"][selected="true"]:hover {{
+            background-color: rgba(255, 255, 255, 30);
+        }}
+        QTabWidget#localServicesTabs::pane {{
+            border: 1px solid white;
+        }}
+        QTabWidget#localServicesTabs QTabBar::tab {{
+            color: white;
+            background-color: rgba(255, 255, 255, 30);
+        }}
+        QTabWidget#localServicesTabs QTabBar::tab:selected {{
+            background-color: rgba(255, 255, 255, 60);
+        }}
+        QRadioButton {{
+            color: white;
+        }}
+        QRadioButton::indicator:checked {{
+            background-color: black;
+            border: 2px solid white;
+        }}
+        QWidget#settingsPage QRadioButton::indicator {{
+            width: 13px;
+            height: 13px;
+            border: 1px solid white;
+            border-radius: 7px;
+        }}
+        QWidget#settingsPage QRadioButton::indicator:unchecked {{
+            background-color: transparent;
+        }}
+        QWidget#settingsPage QRadioButton::indicator:checked {{
+            background-color: white;
+            border: 2px solid white;
+        }}
+        QCheckBox {{
+            color: white;
+        }}
+        QCheckBox::indicator {{
+            width: 13px;
+            height: 13px;
+            border: 1px solid white;
+        }}
+        QCheckBox::indicator:unchecked {{
+            background-color: transparent;
+        }}
+        QCheckBox::indicator:checked {{
+            background-color: green;
+        }}
+        QTableWidget {{
+            background-color: #2d2d2d;
+            color: #ffffff;
+            gridline-color: #3a3a3a;
+        }}
+        QTableWidget::item {{
+            padding: 5px;
+        }}
+        QHeaderView::section {{
+            background-color: #3a3a3a;
+            color: #ffffff;
+            padding: 5px;
+            border: 1px solid #2d2d2d;
+        }}
+        QLabel#statusIndicator {{
+            border: 2px solid #ff4d4d;
+            border-radius: 10px;
+            padding: 2px;
+        }}
+        QLabel#statusIndicator[status="green"] {{
+            background-color: green;
+            color: black;
+        }}
+        QLabel#statusIndicator[status="red"] {{
+            background-color: red;
+            color: black;
+        }}
+        QLabel#statusIndicator[status="yellow"] {{
+            background-color: yellow;
+            color: black;
+        }}
+        QLabel#systemInfo {{
+            color: lightgray;
+            font-size: 10px;
+        }}
+        QLabel#gaugeInfo {{
+            color: white;
+            font-size: 12px;
+        }}
+    """
+        _stylesheets[theme] = stylesheet
+    return stylesheet
+
+def set_theme_gradient(window, theme):
+    _, gradient_start = get_color_theme(theme)
+
+    # Object-bounding coordinates stretch the gradient to the window, so resizing
+    # needs no palette or stylesheet update at all
+    gradient = QLinearGradient(0, 0, 0, 1)
+    gradient.setCoordinateMode(QGradient.CoordinateMode.ObjectBoundingMode)
+    gradient.setColorAt(0, QColor(gradient_start))
+    gradient.setColorAt(1, QColor(0, 0, 0))  # Black at bottom
+
+    palette = window.palette()
+    palette.setBrush(QPalette.ColorRole.Window, QBrush(gradient))
+    window.setPalette(palette)
+
+def set_style_state(widget, name, value):
+    # Flip a dynamic property the central stylesheet keys on, re-polishing just this widget
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
+def set_color_theme(window, theme):
+    # Setting a stylesheet re-polishes the whole widget tree, so only do it when the theme changes
+    if getattr(window, 'applied_theme', None) == theme:
+        return
+    set_theme_gradient(window, theme)
+    window.setStyleSheet(get_theme_stylesheet(theme))
+    window.applied_theme = theme
@@ -0,0 +1,201 @@
+import html
+from collections import OrderedDict
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView, QApplication, QStyle
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex, QSize, QTimer
+from PyQt6.QtGui import QTextDocument, QAbstractTextDocumentLayout, QPalette, QColor, QAction
+
+ROLE_ROLE = Qt.ItemDataRole.UserRole + 1
+REVISION_ROLE = Qt.ItemDataRole.UserRole + 2
+CACHED_ROLE = Qt.ItemDataRole.UserRole + 3
+
+MESSAGE_SPACING = 12
+MAX_CACHED_DOCUMENTS = 300
+
+class TranscriptModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.messages = []  # [role, content, revision, served from response cache]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.messages)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self.messages[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return message[1]
+        if role == ROLE_ROLE:
+            return message[0]
+        if role == REVISION_ROLE:
+            return message[2]
+        if role == CACHED_ROLE:
+            return message[3]
+        return None
+
+    def set_messages(self, messages):
+        self.beginResetModel()
+        self.messages = [[m["role"], m["content"], 0, m.get("cached", False)] for m in messages]
+        self.endResetModel()
+
+    def append_message(self, role, content, cached=False):
+        row = len(self.messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.messages.append([role, content, 0, cached])
+        self.endInsertRows()
+
+    def remove_last_message(self):
+        if not self.messages:
+            return
+        row = len(self.messages) - 1
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.messages.pop()
+        self.endRemoveRows()
+
+    def update_last_message(self, content):
+        if not self.messages:
+            return
+        message = self.messages[-1]
+        message[1] = content
+        message[2] += 1
+        index = self.index(len(self.messages) - 1)
+        self.dataChanged.emit(index, index)
+
+class MessageDelegate(QStyledItemDelegate):
+    # Rows are laid out with a cheap font-metrics estimate until they are painted.
+    # Only painted (visible) rows get a real QTextDocument layout, which is cached
+    # per row and reused until the message or the view width changes.
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.heights = {}  # row -> (revision, width, height)
+        self.documents = OrderedDict()  # row -> (revision, width, QTextDocument)
+
+    def clear_cache(self):
+        self.heights.clear()
+        self.documents.clear()
+
+    def forget_row(self, row):
+        # Cache entries are keyed by row, so a removed row must not leak into the next one
+        self.heights.pop(row, None)
+        self.documents.pop(row, None)
+
+    def content_width(self):
+        return max(50, self.view.viewport().width() - 4)
+
+    def message_html(self, index):
+        role = html.escape(index.data(ROLE_ROLE).capitalize())
+        content = html.escape(index.data()).replace("\n", "<br>")
+        marker = " <i>(cached)</i>" if index.data(CACHED_ROLE) else ""
+        return f"<font color='white'><b>{role}:</b>{marker} {content}</font>"
+
+    def document(self, index):
+        row = index.row()
+        revision = index.data(REVISION_ROLE)
+        width = self.content_width()
+        cached = self.documents.get(row)
+        if cached and cached[0] == revision:
+            doc = cached[2]
+            if cached[1] != width:
+                doc.setTextWidth(width)
+                self.documents[row] = (revision, width, doc)
+            self.documents.move_to_end(row)
+        else:
+            doc = QTextDocument()
+            doc.setDefaultFont(self.view.font())
+            doc.setHtml(self.message_html(index))
+            doc.setTextWidth(width)
+            self.documents[row] = (revision, width, doc)
+            if len(self.documents) > MAX_CACHED_DOCUMENTS:
+                self.documents.popitem(last=False)
+        return doc
+
+    def estimate_height(self, index, width):
+        metrics = self.view.fontMetrics()
+        chars_per_line = max(1, width // max(1, metrics.averageCharWidth()))
+        text = f"{index.data(ROLE_ROLE)}: {index.data()}"
+        lines = sum(len(paragraph) // chars_per_line + 1 for paragraph in text.split("\n"))
+        return lines * metrics.lineSpacing() + 8
+
+    def sizeHint(self, option, index):
+        width = self.content_width()
+        cached = self.heights.get(index.row())
+        if cached and cached[0] == index.data(REVISION_ROLE) and cached[1] == width:
+            height = cached[2]
+        else:
+            height = self.estimate_height(index, width)
+        return QSize(width, int(height) + MESSAGE_SPACING)
+
+    def paint(self, painter, option, index):
+        doc = self.document(index)
+        row = index.row()
+        revision = index.data(REVISION_ROLE)
+        width = self.content_width()
+        height = doc.size().height()
+
+        previous = self.heights.get(row)
+        if previous and previous[0] == revision and previous[1] == width:
+            laid_out_height = previous[2]
+        else:
+            laid_out_height = self.estimate_height(index, width)
+        self.heights[row] = (revision, width, height)
+        if laid_out_height != height:
+            # The estimate was off; re-lay out this row once the paint pass is done
+            persistent = QPersistentModelIndex(index)
+            QTimer.singleShot(0, lambda: persistent.isValid() and self.sizeHintChanged.emit(QModelIndex(persistent)))
+
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, QColor(255, 255, 255, 20))
+        painter.translate(option.rect.topLeft())
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.ColorRole.Text, QColor("white"))
+        doc.documentLayout().draw(painter, context)
+        painter.restore()
+
+class TranscriptView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.transcript_model = TranscriptModel(self)
+        self.setModel(self.transcript_model)
+        self.delegate = MessageDelegate(self)
+        self.setItemDelegate(self.delegate)
+
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        self.setUniformItemSizes(False)
+        self.setWordWrap(True)
+
+        copy_action = QAction("Copy Message", self)
+        copy_action.triggered.connect(self.copy_current_message)
+        self.addAction(copy_action)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
+
+    def set_messages(self, messages):
+        self.delegate.clear_cache()
+        self.transcript_model.set_messages(messages)
+        self.scrollToBottom()
+
+    def append_message(self, role, content, cached=False):
+        self.transcript_model.append_message(role, content, cached)
+        self.scrollToBottom()
+
+    def remove_last_message(self):
+        self.delegate.forget_row(self.transcript_model.rowCount() - 1)
+        self.transcript_model.remove_last_message()
+
+    def update_last_message(self, content):
+        at_bottom = self.verticalScrollBar().value() == self.verticalScrollBar().maximum()
+        self.transcript_model.update_last_message(content)
+        if at_bottom:
+            self.scrollToBottom()
+
+    def copy_current_message(self):
+        index = self.currentIndex()
+        if index.isValid():
+            QApplication.clipboard().setText(index.data())
@@ -0,0 +1,66 @@
+import uuid
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Request states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+MAX_PROVIDER_THREADS = 4
+
+class RequestSignals(QObject):
+    state_changed = pyqtSignal(str, str)  # (request_id, state)
+    chunk = pyqtSignal(str, str)  # (request_id, partial output)
+    finished = pyqtSignal(str, object)  # (request_id, result)
+    failed = pyqtSignal(str, str)  # (request_id, error message)
+
+class ProviderRequest(QRunnable):
+    # Runs fn(*args) on the shared pool; results come back to the GUI thread
+    # through queued signals, so fn must never touch widgets. Streaming requests
+    # also get an on_chunk callback that forwards partial output as it arrives.
+    def __init__(self, fn, *args, stream=False):
+        super().__init__()
+        self.request_id = str(uuid.uuid4())
+        self.fn = fn
+        self.args = args
+        self.stream = stream
+        self.signals = RequestSignals()
+        self.state = QUEUED
+
+    def set_state(self, state):
+        self.state = state
+        self.signals.state_changed.emit(self.request_id, state)
+
+    def emit_chunk(self, text):
+        self.signals.chunk.emit(self.request_id, text)
+
+    def run(self):
+        self.set_state(RUNNING)
+        try:
+            if self.stream:
+                result = self.fn(*self.args, on_chunk=self.emit_chunk)
+            else:
+                result = self.fn(*self.args)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(self.request_id, str(e))
+            self.set_state(FAILED)
+        else:
+            self.signals.finished.emit(self.request_id, result)
+            self.set_state(DONE)
+
+_provider_pool = None
+
+def provider_pool():
+    global _provider_pool
+    if _provider_pool is None:
+        _provider_pool = QThreadPool()
+        _provider_pool.setMaxThreadCount(MAX_PROVIDER_THREADS)
+    return _provider_pool
+
+def start_request(request):
+    request.signals.state_changed.emit(request.request_id, QUEUED)
+    provider_pool().start(request)
+    return request
@@ -1,23 +1,28 @@
 import sys
-import time
 import configparser
 import os
-import pickle
+from lib.startup_trace import tracer
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QStatusBar, QTabWidget, QVBoxLayout, QLabel, 
                              QPushButton, QHBoxLayout, QStackedWidget)
-from PyQt6.QtGui import QPixmap, QPainter, QIcon, QMouseEvent
+from PyQt6.QtGui import QPixmap, QPainter, QIcon, QMouseEvent, QColor
 from PyQt6.QtCore import Qt, QTimer, QPoint, QUrl
 from lib.settings import SettingsPage
 from lib.session_manager import session_manager
-from lib.podman import create_status_indicator, update_podman_status, update_container_status, show_container_action_dialog
+from lib.chat_store import close_chat_store
+from lib.podman import create_status_indicator, set_status_color, collect_status_colors, show_container_action_dialog
 from lib.theme import set_color_theme, get_color_theme
 from lib.menu import MenuPanel
 from lib.perfmon import PerformanceMonitor
-from lib.chat import LLMPage
-from lib.enhanced_browser import EnhancedTabWidget, get_tab_data
+from lib.telemetry import get_telemetry_sampler
+from lib.enhanced_browser import EnhancedTabWidget, get_tab_data, get_tab_lifecycle, get_shared_profile
+from lib.workers import ProviderRequest, start_request
+from lib.startup import StartupLoader
+from lib.session_snapshot import SessionSnapshotter, read_session_snapshot
 
 APP_VERSION = "1.4.0"
 BUILD_DATE = "Sep 2024"
+PAGE_HOME, PAGE_LLM, PAGE_SD, PAGE_TTS, PAGE_STS, PAGE_SETTINGS = range(6)
+PAGE_NAMES = ["Home", "LLM", "Generative AI", "Text-To-Speech", "Speech-To-Speech", "Settings"]
 os.environ['QTWEBENGINE_DISABLE_SANDBOX'] = '1'
 
 class CasePreservingConfigParser(configparser.ConfigParser):
@@ -33,22 +38,36 @@ class SplashScreen(QWidget):
                             Qt.WindowType.FramelessWindowHint |
                             Qt.WindowType.Tool)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.message = ""
+
+    def set_message(self, message):
+        self.message = message
+        self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.drawPixmap(self.rect(), self.pixmap)
+        if self.message:
+            painter.setPen(QColor("white"))
+            text_rect = self.rect().adjusted(10, 0, -10, -10)
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter, self.message)
 
     def mousePressEvent(self, event):
         self.close()
 
 class MainWindow(QMainWindow):
-    def __init__(self, config):
+    def __init__(self, config, preloaded=None):
         super().__init__()
         self.config = config
+        self.preloaded = preloaded or {}
+        self.status_request = None
         self.dragging = False
         self.offset = QPoint()
+        self.first_status_applied = False
+        self.first_paint_done = False
         print("Initializing MainWindow")
-        self.setup_ui()
+        with tracer.span("MainWindow.setup_ui"):
+            self.setup_ui()
 
     def setup_ui(self):
         print("Setting up UI")
@@ -63,6 +82,12 @@ class MainWindow(QMainWindow):
         # Set app icon
         self.setWindowIcon(QIcon("img/ASIC.ico"))
 
+        # Idle web tabs are frozen/discarded according to [Settings]
+        get_tab_lifecycle().configure(self.config)
+
+        # Create the web profile shared by every tab before any page needs it
+        get_shared_profile(self.config)
+
         # Set initial color theme
         self.set_color_theme(theme_color)
 
@@ -126,7 +151,7 @@ class MainWindow(QMainWindow):
         content_layout = QHBoxLayout()
 
         # Create menu panel
-        self.menu_panel = MenuPanel(base_color, APP_VERSION, BUILD_DATE)  # Pass APP_VERSION and BUILD_DATE here
+        self.menu_panel = MenuPanel(base_color, APP_VERSION, BUILD_DATE, self.preloaded.get('system_info'))
         self.menu_panel.page_changed.connect(self.change_page)
         content_layout.addWidget(self.menu_panel)
 
@@ -145,23 +170,28 @@ class MainWindow(QMainWindow):
 
         main_layout.addLayout(content_layout)
 
-        # Create pages
-        self.home_page = self.create_home_page()
-        self.llm_page = LLMPage(self.config, base_color)
-        # Create EnhancedTabWidget instances for different sections
-        self.sd_page = EnhancedTabWidget(self)
-        self.tts_page = EnhancedTabWidget(self)
-        self.sts_page = EnhancedTabWidget(self)
-        self.settings_page = SettingsPage(self.config)
-        self.settings_page.save_and_reload.connect(self.on_save_and_reload)
+        # Create pages. Only Home is built up front; the rest sit behind
+        # placeholders until change_page first navigates to them
+        self.base_color = base_color
+        with tracer.span("page: Home"):
+            self.home_page = self.create_home_page()
+        self.llm_page = None
+        self.sd_page = None
+        self.tts_page = None
+        self.sts_page = None
+        self.settings_page = None
+        self.page_factories = {
+            PAGE_LLM: self.create_llm_page,
+            PAGE_SD: lambda: self.create_tab_page('sd_page', 'Generative AI', 'sd'),
+            PAGE_TTS: lambda: self.create_tab_page('tts_page', 'Text-To-Speech', 'tts'),
+            PAGE_STS: lambda: self.create_tab_page('sts_page', 'Speech-To-Speech', 'sts'),
+            PAGE_SETTINGS: self.create_settings_page,
+        }
 
         # Add pages to stacked widget
         self.stacked_widget.addWidget(self.home_page)
-        self.stacked_widget.addWidget(self.llm_page)
-        self.stacked_widget.addWidget(self.sd_page)
-        self.stacked_widget.addWidget(self.tts_page)
-        self.stacked_widget.addWidget(self.sts_page)
-        self.stacked_widget.addWidget(self.settings_page)
+        for index in sorted(self.page_factories):
+            self.stacked_widget.insertWidget(index, QWidget())
 
         # Set up central widget
         central_widget = QWidget()
@@ -204,11 +234,19 @@ class MainWindow(QMainWindow):
         status_font.setPointSize(9)
         self.status_bar.setFont(status_font)
 
-        # Load saved tabs
-        self.load_tabs()
+        # Saved tabs are restored into each browser page when it is first built
+        self.saved_tabs = self.preloaded.get('saved_tabs')
+        if self.saved_tabs is None:
+            self.saved_tabs = read_session_snapshot()
 
-        # Update status indicators
-        self.update_status_indicators()
+        # Tab changes are snapshotted to disk in the background, so a crash loses at most a second
+        self.snapshotter = SessionSnapshotter(self.collect_tab_data, parent=self)
+
+        # Update status indicators, reusing the checks made while the splash was up
+        if 'status_colors' in self.preloaded:
+            self.apply_status_colors(self.preloaded['status_colors'])
+        else:
+            self.update_status_indicators()
 
         # Set up a timer to periodically update status
         self.timer = QTimer(self)
@@ -222,8 +260,8 @@ class MainWindow(QMainWindow):
     def on_save_and_reload(self, selected_theme):
         print(f"Reloading UI with theme: {selected_theme}")
 
-        # Re-read the config file
-        self.config.read('cfg/config.ini')
+        # SettingsPage edits this same config object, so there is nothing to re-read from disk
+        get_tab_lifecycle().configure(self.config)
 
         # Apply the new theme
         self.apply_theme(selected_theme)
@@ -231,11 +269,12 @@ class MainWindow(QMainWindow):
         # Reload other parts of the UI
         self.reload_ui_components()
 
-        # Reload tabs
-        self.load_tabs()
+        # Reload tabs from the in-memory tab state
+        self.load_tabs(self.collect_tab_data())
 
         # Update the LLM page
-        self.llm_page.load_local_services()
+        if self.llm_page is not None:
+            self.llm_page.load_local_services()
 
         # Force a repaint of the entire window
         self.repaint()
@@ -244,11 +283,13 @@ class MainWindow(QMainWindow):
         set_color_theme(self, theme)
 
     def reload_ui_components(self):
-        self.settings_page.refresh_tables()
+        if self.settings_page is not None:
+            self.settings_page.refresh_tables()
 
-        if hasattr(self, 'performance_monitor'):
-            self.performance_monitor.cpu_type = self.config['Settings'].get('CPUType', 'Intel')
-            self.performance_monitor.gpu_type = self.config['Settings'].get('GPUType', 'NVIDIA')
+        if hasattr(self, 'perf_monitor'):
+            self.perf_monitor.cpu_type = self.config['Settings'].get('CPUType', 'Intel')
+            self.perf_monitor.gpu_type = self.config['Settings'].get('GPUType', 'NVIDIA')
+            get_telemetry_sampler(self.config)
 
     def create_home_page(self):
         home_page = QWidget()
@@ -262,31 +303,75 @@ class MainWindow(QMainWindow):
         home_layout.addWidget(home_image, alignment=Qt.AlignmentFlag.AlignCenter)
         return home_page
 
+    def create_llm_page(self):
+        from lib.chat import LLMPage
+        self.llm_page = LLMPage(self.config, self.base_color)
+        self.load_section_tabs('LLMs', self.llm_page.tab_widget, self.saved_tabs.get('llm', []))
+        self.llm_page.tab_widget.tabs_changed.connect(self.snapshotter.schedule)
+        return self.llm_page
+
+    def create_tab_page(self, attribute, section, key):
+        page = EnhancedTabWidget(self)
+        setattr(self, attribute, page)
+        self.load_section_tabs(section, page, self.saved_tabs.get(key, []))
+        page.tabs_changed.connect(self.snapshotter.schedule)
+        return page
+
+    def create_settings_page(self):
+        self.settings_page = SettingsPage(self.config)
+        self.settings_page.save_and_reload.connect(self.on_save_and_reload)
+        return self.settings_page
+
+    def ensure_page(self, index):
+        factory = self.page_factories.pop(index, None)
+        if factory is None:
+            return
+        print(f"Building page {index}")
+        placeholder = self.stacked_widget.widget(index)
+        with tracer.span(f"page: {PAGE_NAMES[index]}"):
+            page = factory()
+        self.stacked_widget.insertWidget(index, page)
+        self.stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+
     def set_color_theme(self, theme):
         set_color_theme(self, theme)
 
-    def load_tabs(self):
+    def tab_pages(self):
+        return {
+            'llm': ('LLMs', self.llm_page.tab_widget if self.llm_page is not None else None),
+            'sd': ('Generative AI', self.sd_page),
+            'tts': ('Text-To-Speech', self.tts_page),
+            'sts': ('Speech-To-Speech', self.sts_page),
+        }
+
+    def collect_tab_data(self):
+        # Pages that were never opened keep the state they were restored with
+        tabs_data = dict(self.saved_tabs)
+        for key, (section, tab_widget) in self.tab_pages().items():
+            if tab_widget is not None:
+                tabs_data[key] = get_tab_data(tab_widget)
+        return tabs_data
+
+    def load_tabs(self, saved_tabs=None):
         print("Loading tabs")
-        try:
-            with open('cfg/saved_tabs.pkl', 'rb') as f:
-                saved_tabs = pickle.load(f)
-        except FileNotFoundError:
-            saved_tabs = {}
-
-        # Clear existing tabs
-        self.llm_page.tab_widget.clear()
-        self.sd_page.clear()
-        self.tts_page.clear()
-        self.sts_page.clear()
-
-        # Load tabs from config, restore saved state if available
-        self.load_section_tabs('LLMs', self.llm_page.tab_widget, saved_tabs.get('llm', []))
-        self.load_section_tabs('Generative AI', self.sd_page, saved_tabs.get('sd', []))
-        self.load_section_tabs('Text-To-Speech', self.tts_page, saved_tabs.get('tts', []))
-        self.load_section_tabs('Speech-To-Speech', self.sts_page, saved_tabs.get('sts', []))
+        with tracer.span("load_tabs"):
+            if saved_tabs is None:
+                saved_tabs = self.collect_tab_data()
+            self.saved_tabs = saved_tabs
+
+            # Clear and reload tabs on the pages that have been built, restoring saved state if available
+            for key, (section, tab_widget) in self.tab_pages().items():
+                if tab_widget is not None:
+                    tab_widget.clear_tabs()
+                    self.load_section_tabs(section, tab_widget, saved_tabs.get(key, []))
 
     def load_section_tabs(self, section, tab_widget, saved_tabs):
         print(f"Loading tabs for section: {section}")
+        with tracer.span(f"load_section_tabs: {section}"):
+            self.restore_section_tabs(section, tab_widget, saved_tabs)
+
+    def restore_section_tabs(self, section, tab_widget, saved_tabs):
         config_urls = {url: name for name, url in self.config[section].items()}
 
         # First, restore saved tabs that are still in the config
@@ -300,11 +385,38 @@ class MainWindow(QMainWindow):
             tab_widget.create_web_tab(name, url)
 
     def update_status_indicators(self):
+        # podman can take seconds to answer, so poll on the worker pool
+        if self.status_request is not None:
+            return
         if self.config['Settings'].getboolean('EnableContainers', fallback=True):
-            update_podman_status(self.status_indicators['Podman'])
-            for container_name, container_id in self.config['Containers'].items():
-                update_container_status(container_name, container_id, self.status_indicators[container_name])
-
+            if not self.first_status_applied:
+                tracer.begin("first status poll")
+            self.status_request = ProviderRequest(collect_status_colors, list(self.config['Containers'].items()))
+            self.status_request.signals.finished.connect(lambda request_id, colors: self.apply_status_colors(colors))
+            self.status_request.signals.failed.connect(lambda request_id, error: self.apply_status_colors({}))
+            start_request(self.status_request)
+
+    def apply_status_colors(self, colors):
+        self.status_request = None
+        if not self.first_status_applied:
+            self.first_status_applied = True
+            tracer.end("first status poll")
+            tracer.instant("first status applied")
+            self.check_startup_complete()
+        for name, color in colors.items():
+            if name in self.status_indicators:
+                set_status_color(self.status_indicators[name], color)
+
+
+    def on_first_paint(self):
+        self.first_paint_done = True
+        self.check_startup_complete()
+
+    def check_startup_complete(self):
+        # Startup ends once the window has painted and the first container status is in
+        containers_enabled = self.config['Settings'].getboolean('EnableContainers', fallback=True)
+        if self.first_paint_done and (self.first_status_applied or not containers_enabled):
+            tracer.finish()
 
     def container_clicked(self, container_name):
         container_id = self.config['Containers'][container_name]
@@ -312,20 +424,17 @@ class MainWindow(QMainWindow):
         self.update_status_indicators()
 
     def change_page(self, index):
+        self.ensure_page(index)
         self.stacked_widget.setCurrentIndex(index)
 
     def closeEvent(self, event):
         print("Closing application, saving tabs")
-        tabs_data = {
-            'llm': get_tab_data(self.llm_page.tab_widget),
-            'sd': get_tab_data(self.sd_page),
-            'tts': get_tab_data(self.tts_page),
-            'sts': get_tab_data(self.sts_page)
-        }
-        with open('cfg/saved_tabs.pkl', 'wb') as f:
-            pickle.dump(tabs_data, f)
+        tracer.finish()
+        self.snapshotter.flush()
+        get_telemetry_sampler().stop()
         with open('cfg/config.ini', 'w') as configfile:
             self.config.write(configfile)
+        close_chat_store()
         event.accept()
 
     def toggle_maximize(self):
@@ -346,29 +455,30 @@ class MainWindow(QMainWindow):
     def mouseReleaseEvent(self, event):
         self.dragging = False
 
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
-        self.set_color_theme(self.config.get('Settings', 'ColorTheme', fallback='Dark Red'))
-
 def main():
     print("Starting application...")
-    app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon("img/ASIC.ico"))  # Set app icon for the entire application
+    tracer.add_span("imports", 0, tracer.now())
+    with tracer.span("QApplication"):
+        app = QApplication(sys.argv)
+        app.setWindowIcon(QIcon("img/ASIC.ico"))  # Set app icon for the entire application
     print("QApplication created")
 
     # Read config
-    config = CasePreservingConfigParser()
-    config.read('cfg/config.ini')
+    with tracer.span("config"):
+        config = CasePreservingConfigParser()
+        config.read('cfg/config.ini')
 
     # Show splash screen
-    splash = SplashScreen()
-    screen = QApplication.primaryScreen().availableGeometry()
-    splash_geo = splash.geometry()
-    centered_pos = screen.center() - splash_geo.center()
-    splash.move(centered_pos)
-    splash.show()
+    with tracer.span("splash"):
+        splash = SplashScreen()
+        screen = QApplication.primaryScreen().availableGeometry()
+        splash_geo = splash.geometry()
+        centered_pos = screen.center() - splash_geo.center()
+        splash.move(centered_pos)
+        splash.show()
 
     # Process session data
+    tracer.begin("session_manager")
     session_data = {'user_id': 1337, 'username': 'ai_garage'}  # example session data
     cookies = [{'name': 'cookie1', 'value': 'value1'}, {'name': 'cookie2', 'value': 'value2'}]  # example cookies
 
@@ -384,22 +494,33 @@ def main():
     if cookies:
         # restore cookies
         print("Restored cookies:", cookies)
+    tracer.end("session_manager")
 
-    # Simulate loading time
-    start_time = time.time()
-    while time.time() - start_time < 2:
-        app.processEvents()
-
-    # Create and show main window
-    main_window = MainWindow(config)
-    print("Main window created")
-
-    # Close splash screen and show main window
-    splash.close()
-    main_window.show()
+    # Probe hardware, restore tabs and check containers in the background
+    # while the splash is up, then build the main window as soon as they finish
+    windows = []
 
-    # Update container visibility after showing the main window
-    main_window.update_container_visibility()
+    def show_main_window(preloaded):
+        splash.set_message("Building interface...")
+        app.processEvents()
+        tracer.end("startup tasks")
+        main_window = MainWindow(config, preloaded)
+        windows.append(main_window)
+        print("Main window created")
+
+        # Close splash screen and show main window
+        splash.close()
+        tracer.watch_first_paint(main_window, main_window.on_first_paint)
+        main_window.show()
+
+        # Update container visibility after showing the main window
+        main_window.update_container_visibility()
+
+    tracer.begin("startup tasks")
+    loader = StartupLoader(config)
+    loader.progress.connect(splash.set_message)
+    loader.finished.connect(show_main_window)
+    loader.start()
 
     sys.exit(app.exec())
 
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Fails if importing main.py gets slower than the budget or pulls in a provider SDK.
+# Run from the repo root: python3 tools/check_import_budget.py [--budget-ms 1500]
+import os
+import sys
+import argparse
+import subprocess
+
+DEFAULT_BUDGET_MS = 1500
+REPEATS = 3
+
+# These must only be imported when their service is opened
+FORBIDDEN_MODULES = ["anthropic", "google.generativeai", "openai"]
+
+def measure_imports():
+    # Returns [(module, cumulative microseconds, nesting depth)] for one cold `import main`,
+    # in the order -X importtime reports them (children before their parent)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=root, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(f"import main failed with exit code {result.returncode}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(cumulative), depth))
+    return modules
+
+def main_imports(modules):
+    # Everything reported between the previous top-level import and main itself
+    end = next(i for i, (name, us, depth) in enumerate(modules) if name == "main" and depth == 0)
+    start = end
+    while start > 0 and modules[start - 1][2] > 0:
+        start -= 1
+    return modules[start:end + 1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the startup import-time budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    # Take the best of a few runs so disk cache noise doesn't fail the check
+    runs = [main_imports(measure_imports()) for _ in range(REPEATS)]
+    modules = min(runs, key=lambda m: m[-1][1])
+    total_ms = modules[-1][1] / 1000
+    imported = {name for name, us, depth in modules}
+
+    print(f"Startup imports: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    slowest = sorted(((us, name) for name, us, depth in modules if depth == 1), reverse=True)
+    for us, name in slowest[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    for name in FORBIDDEN_MODULES:
+        if name in imported:
+            failures.append(f"{name} is imported at startup")
+    if total_ms > args.budget_ms:
+        failures.append(f"startup imports took {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())